@@ -0,0 +1,390 @@
+import cv2
+import numpy as np
+import os
+import keyboard  # New import for detecting key presses from the console
+from datetime import datetime, timedelta
+
+
+# Function to precompute the result of blending a color with the given opacity over every
+# 0-255 channel value. cv2.addWeighted itself is used, so looking values up in this table
+# gives the same result as blending a full overlay image.
+def blend_table(color, opacity):
+    values = np.repeat(np.arange(256, dtype=np.uint8)[:, np.newaxis], 3, axis=1)
+    overlay = np.empty_like(values)
+    overlay[:] = color
+    return cv2.addWeighted(overlay, opacity, values, 1 - opacity, 0)
+
+
+# Function to draw a semi-transparent ring with a filled white circle at the end, only inside rect.
+# The shapes are rasterized in full frame coordinates on the scratch mask (so they have exactly
+# the same pixels as when drawn on the whole frame), only the masked pixels of the rectangle are
+# blended with the precomputed table, and the mask is cleared again by drawing the shapes with 0.
+def draw_semi_transparent_ring_with_circle(image, mask, rect, center, radius, start_angle, end_angle, table, thickness):
+    x0, y0, x1, y1 = rect
+    roi = image[y0:y1, x0:x1]
+    roi_mask = mask[y0:y1, x0:x1]
+
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 255, thickness)
+    ring = roi_mask > 0
+    roi[ring] = table[roi[ring], np.arange(3)]
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 0, thickness)
+
+    # Calculate the position of the small white circle at the end of the arc
+    end_radian = np.radians(start_angle + end_angle)
+    circle_center = (
+        int(center[0] + radius * np.cos(end_radian)),
+        int(center[1] + radius * np.sin(end_radian))
+    )
+    # Draw the small white circle
+    cv2.circle(mask, circle_center, 10, 255, -1)  # Radius of 10 pixels, filled circle
+    roi[roi_mask > 0] = (255, 255, 255)
+    cv2.circle(mask, circle_center, 10, 0, -1)
+
+
+# Function to draw the static dial: thin rings with their division marks.
+# The marks never change during a video, so this is called once per video on the background.
+def draw_tick_dial(image, center, outer_radius, ring_thickness, start_angle, color, thickness):
+    segments = []
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, color, thickness)
+
+        # Angles and mark lengths of every division at once (major marks every 5 divisions)
+        index = np.arange(divisions)
+        angles = np.radians(start_angle + index * (360 / divisions))
+        line_length = np.where(index % 5 == 0, 10, 5)
+        cos, sin = np.cos(angles), np.sin(angles)
+
+        # Inside marks go from (radius - length) to radius, outside marks from radius to (radius + length)
+        inner = radius - line_length
+        outer = radius + line_length
+        points = [
+            np.stack([center[0] + r * cos, center[1] + r * sin], axis=-1).astype(np.int32)
+            for r in (inner, radius, outer)
+        ]
+        segments.extend(np.stack([points[0], points[1]], axis=1))
+        segments.extend(np.stack([points[1], points[2]], axis=1))
+
+    # Draw all the marks with a single call
+    cv2.polylines(image, segments, False, color, thickness)
+
+
+# Function to rasterize the countdown characters once for a font, scale and thickness.
+# Each glyph is kept as a mask cropped to its strokes, the offset of that crop from the
+# text origin and the advance cv2.putText moves to the right after the character.
+def build_glyph_atlas(font, font_scale, thickness, characters="0123456789:"):
+    (_, text_height), baseline = cv2.getTextSize(characters, font, font_scale, thickness)
+    margin = int(32 * font_scale) + thickness  # Script fonts draw well outside their text box
+
+    atlas = {}
+    for char in characters:
+        advance = cv2.getTextSize(char, font, font_scale, thickness)[0][0] - thickness
+        canvas = np.zeros((text_height + baseline + 2 * margin, advance + 2 * margin), dtype=np.uint8)
+        origin = (margin, margin + text_height)
+        cv2.putText(canvas, char, origin, font, font_scale, 255, thickness)
+
+        ys, xs = np.nonzero(canvas)
+        top, left = ys.min(), xs.min()
+        mask = canvas[top:ys.max() + 1, left:xs.max() + 1] > 0
+        atlas[char] = (mask, left - origin[0], top - origin[1], advance)
+    return atlas
+
+
+# Function to compute the x position of every character of a time string centered on center_x
+# (the same positions cv2.getTextSize and cv2.putText would give the whole string)
+def glyph_positions(time_str, atlas, center_x, thickness):
+    text_width = sum(atlas[char][3] for char in time_str) + thickness
+    x = center_x - text_width // 2
+    positions = []
+    for char in time_str:
+        positions.append(x)
+        x += atlas[char][3]
+    return positions
+
+
+# Function to draw a time string by copying the cached glyph masks onto the image.
+# origin is the position of the image inside the full frame, so the text can be drawn
+# into a region of the frame; glyphs are clipped to the image.
+def draw_glyph_text(image, time_str, positions, text_y, atlas, color, origin=(0, 0)):
+    height, width = image.shape[:2]
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        top, left = text_y + offset_y - origin[1], x + offset_x - origin[0]
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + mask.shape[0], height), min(left + mask.shape[1], width)
+        if y0 < y1 and x0 < x1:
+            image[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - left:x1 - left]] = color
+
+
+# Function to get the bounding rectangle (x0, y0, x1, y1) of a time string drawn from the atlas
+def glyph_text_rect(time_str, positions, text_y, atlas):
+    x0 = y0 = float("inf")
+    x1 = y1 = float("-inf")
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        x0, y0 = min(x0, x + offset_x), min(y0, text_y + offset_y)
+        x1, y1 = max(x1, x + offset_x + mask.shape[1]), max(y1, text_y + offset_y + mask.shape[0])
+    return (x0, y0, x1, y1)
+
+
+# Function to get the bounding rectangle of the part of a ring between two angles
+# (in degrees from start_angle), padded to include the ring thickness and the end circle
+def arc_rect(center, radius, start_angle, angle_from, angle_to, pad):
+    first, last = start_angle + angle_from, start_angle + angle_to
+    # The arc reaches its extremes at its ends and wherever it crosses an axis
+    angles = np.radians([first, last] + [90 * k for k in range(-(-first // 90), last // 90 + 1)])
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
+    return (int(xs.min()) - pad, int(ys.min()) - pad, int(xs.max()) + pad + 1, int(ys.max()) + pad + 1)
+
+
+# Function to check if two rectangles overlap
+def rects_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# Function to clip rectangles to the frame and merge the ones that overlap,
+# so no area of the frame is restored and redrawn twice
+def merge_rects(rects, width, height):
+    merged = []
+    for rect in rects:
+        rect = (max(rect[0], 0), max(rect[1], 0), min(rect[2], width), min(rect[3], height))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            continue
+        i = 0
+        while i < len(merged):
+            if rects_overlap(merged[i], rect):
+                other = merged.pop(i)
+                rect = (min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3]))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+# List of available fonts in OpenCV
+fonts = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX_SMALL,
+    cv2.FONT_HERSHEY_SCRIPT_SIMPLEX,
+    cv2.FONT_HERSHEY_SCRIPT_COMPLEX,
+]
+
+# Ensure the "render" folder exists
+os.makedirs("render", exist_ok=True)
+
+# Time intervals for the countdowns
+time_intervals = [
+    10, 20, 30,  # 10, 20, 30 seconds
+    *[60 * i for i in range(1, 11)],  # 1-10 minutes
+    *[60 * i for i in range(10, 61, 5)]  # 10-60 minutes (every 5 minutes)
+]
+
+# Two digit strings "00".."99", so the time string is not formatted for every frame
+two_digits = [f"{i:02}" for i in range(100)]
+
+# Render mode:
+#   "hold"      - draw one frame per displayed second and write it fps times (like 001-prueba.py);
+#                 only the rectangles that changed since the previous second are redrawn
+#   "per_frame" - redraw every single frame in full (previous behaviour, useful to compare outputs)
+render_mode = "hold"
+
+# Loop through each font and create versions of the video for each time interval
+for font_index, font in enumerate(fonts):
+    for duration in time_intervals:
+        for variant in ["light_bg", "dark_bg"]:
+            # Define the output file path
+            output_file = f"render/countdown_timer_{duration}s_font_{font_index}_{variant}.mp4"
+
+            # Check if the file already exists
+            if os.path.exists(output_file):
+                print(f"File {output_file} already exists. Skipping to next video.")
+                continue
+
+            # Video properties
+            width, height = 1920, 1080
+            fps = 60
+
+            # Determine background and font colors based on variant
+            if variant == "light_bg":
+                background_color = (255, 255, 255)  # White background
+                font_color = (0, 0, 0)  # Black font
+            else:
+                background_color = (0, 0, 0)  # Black background
+                font_color = (255, 255, 255)  # White font
+
+            # Create a VideoWriter object
+            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+            out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+            # Define a smaller font scale and thickness for the text
+            font_scale = 4  # Smaller text for the countdown
+            thickness = 16  # Slightly reduced thickness for countdown
+
+            # Ring properties
+            center = (width // 2, height // 2)
+            outer_radius = int((height / 2) * 0.9)  # Outer ring radius
+            ring_thickness = 50
+
+            # Rotate the rings 90 degrees counterclockwise by adding 90 degrees to the start angle
+            start_angle = -90
+
+            # Thin rings properties (for divisions)
+            thin_ring_thickness = 2
+            thin_ring_color = (230, 230, 230)  # Grey color
+
+            # Create a background image with the static dial already drawn on it
+            background = np.full((height, width, 3), background_color, dtype=np.uint8)
+            draw_tick_dial(background, center, outer_radius, ring_thickness, start_angle, thin_ring_color, thin_ring_thickness)
+
+            # Rasterize the digits and the colon once for this font, the text is built from these glyphs
+            atlas = build_glyph_atlas(font, font_scale, thickness)
+            text_height = cv2.getTextSize("0", font, font_scale, thickness)[0][1]  # Same for any string
+            text_y = center[1] + text_height // 2
+
+            # When all digits have the same advance every MM:SS (or HH:MM:SS) string has the same
+            # width, so the glyph positions are computed once per format and reused
+            fixed_width = len({atlas[digit][3] for digit in "0123456789"}) == 1
+            format_positions = {}
+
+            # Semi-transparent colors (90% opacity, 10% transparency)
+            red_color = (0, 0, 255)
+            green_color = (0, 255, 0)
+            blue_color = (255, 0, 0)
+            opacity = 0.9
+
+            # Blend results of each ring color over every channel value, computed once
+            red_table = blend_table(red_color, opacity)
+            green_table = blend_table(green_color, opacity)
+            blue_table = blend_table(blue_color, opacity)
+
+            # Scratch mask where the rings are rasterized before being blended into the frame
+            ring_mask = np.zeros((height, width), dtype=np.uint8)
+
+            # Padding around a ring arc: half the ring thickness or the end circle radius (10)
+            ring_pad = max(ring_thickness // 2, 10) + 2
+
+            # The frame is kept between seconds and only its changed rectangles are redrawn
+            frame = background.copy()
+            previous_rings = None
+            previous_time_str = None
+            previous_text_rect = None
+
+            # Calculate the total number of frames
+            total_frames = duration * fps
+
+            # Start time
+            start_time = datetime.now()
+
+            # Second shown by the last drawn frame (None forces the first frame to be drawn)
+            rendered_seconds = None
+
+            for frame_count in range(total_frames):
+                # Check if the Escape key is pressed via the console
+                if keyboard.is_pressed("esc"):  # Check if "Escape" is pressed
+                    print("Escape key pressed. Terminating the video creation process.")
+                    out.release()
+                    exit()
+
+                # Calculate the remaining time in seconds
+                remaining_seconds = duration - (frame_count // fps)
+
+                # In hold mode a frame is only drawn when the displayed second changes,
+                # then the same frame is written to the video for the rest of that second
+                if render_mode == "per_frame" or remaining_seconds != rendered_seconds:
+                    rendered_seconds = remaining_seconds
+
+                    # Calculate the time in MM:SS format (handling hours if needed)
+                    hours = remaining_seconds // 3600
+                    minutes = (remaining_seconds % 3600) // 60
+                    seconds = remaining_seconds % 60
+                    if hours > 0:
+                        time_str = two_digits[hours] + ":" + two_digits[minutes] + ":" + two_digits[seconds]
+                    else:
+                        time_str = two_digits[minutes] + ":" + two_digits[seconds]
+
+                    # Calculate angles for the rings (full circle is 360 degrees)
+                    if duration >= 3600 and hours > 0:
+                        hour_angle = int(360 * (hours / (duration // 3600 if duration // 3600 <= 24 else 24)))
+                    else:
+                        hour_angle = 0  # No hour ring for durations under 1 hour or if hours is 0
+
+                    minute_angle = int(360 * (minutes / 60)) if minutes > 0 else 0
+                    second_angle = int(360 * (seconds / 60)) if seconds > 0 else 0
+
+                    # Rings as (radius, blend table, angle), a ring with angle 0 is not drawn
+                    rings = [
+                        (outer_radius, red_table, hour_angle),  # Hour ring (Red)
+                        (outer_radius - ring_thickness * 2, green_table, minute_angle),  # Minute ring (Green)
+                        (outer_radius - ring_thickness * 4, blue_table, second_angle),  # Second ring (Blue)
+                    ]
+
+                    # Center the countdown timer on the entire image
+                    positions = format_positions.get(len(time_str))
+                    if positions is None:
+                        positions = glyph_positions(time_str, atlas, center[0], thickness)
+                        if fixed_width:
+                            format_positions[len(time_str)] = positions
+                    text_rect = glyph_text_rect(time_str, positions, text_y, atlas)
+
+                    # Find the rectangles that changed since the previously drawn frame:
+                    # the part of every ring between its old and new angle, and the old and new text.
+                    # OpenCV draws arcs as polylines with a point every 5 degrees, so the segment
+                    # before the smaller angle can change too and is included.
+                    if render_mode == "per_frame" or previous_rings is None:
+                        dirty_rects = [(0, 0, width, height)]
+                    else:
+                        dirty_rects = []
+                        for (radius, _, angle), (_, _, previous_angle) in zip(rings, previous_rings):
+                            if angle != previous_angle:
+                                dirty_rects.append(arc_rect(center, radius, start_angle, min(angle, previous_angle) - 5, max(angle, previous_angle), ring_pad))
+                        if time_str != previous_time_str:
+                            dirty_rects.append(previous_text_rect)
+                            dirty_rects.append(text_rect)
+                    previous_rings, previous_time_str, previous_text_rect = rings, time_str, text_rect
+
+                    # Restore every dirty rectangle from the background (the dial is already on it)
+                    # and redraw only the rings and text that overlap it
+                    for rect in merge_rects(dirty_rects, width, height):
+                        x0, y0, x1, y1 = rect
+                        roi = frame[y0:y1, x0:x1]
+                        roi[:] = background[y0:y1, x0:x1]
+
+                        for radius, table, angle in rings:
+                            if angle > 0 and rects_overlap(arc_rect(center, radius, start_angle, 0, angle, ring_pad), rect):
+                                draw_semi_transparent_ring_with_circle(frame, ring_mask, rect, center, radius, start_angle, angle, table, ring_thickness)
+
+                        # Draw the countdown timer from the glyph atlas
+                        if rects_overlap(text_rect, rect):
+                            draw_glyph_text(roi, time_str, positions, text_y, atlas, font_color, (x0, y0))
+
+                # Calculate and print statistics every 60 frames
+                if frame_count % 60 == 0:
+                    time_passed = timedelta(seconds=(duration - remaining_seconds))
+                    time_remaining = timedelta(seconds=remaining_seconds)
+                    percentage_complete = (frame_count / total_frames) * 100
+                    estimated_finish = start_time + timedelta(seconds=remaining_seconds)
+
+                    stats_str = (
+                        f"Time Passed: {time_passed}\n"
+                        f"Time Remaining: {time_remaining}\n"
+                        f"Estimated Finish: {estimated_finish.strftime('%H:%M:%S')}\n"
+                        f"Completion: {percentage_complete:.2f}%"
+                    )
+
+                    # Print statistics to the console
+                    print(f"Font {font_index}, Variant {variant}, Frame: {frame_count}/{total_frames}")
+                    print(stats_str)
+                    print('-' * 40)
+
+                # Write the frame to the video
+                out.write(frame)
+
+            # Release the video writer
+            out.release()
+
+            print(f"Video creation complete and saved in the 'render' folder! Font {font_index}, Duration: {duration} seconds, Variant: {variant}")
@@ -0,0 +1,114 @@
+import cv2
+import numpy as np
+import os
+import shutil
+import subprocess
+import time
+
+
+# Video writer that pipes raw frames to an ffmpeg process (same as in 026-escritor ffmpeg.py,
+# with the encoder settings passed as arguments so several of them can be compared)
+class FFmpegWriter:
+    def __init__(self, output_file, fps, size, codec, preset, pixel_format, tune=None, gop=None, threads=1):
+        width, height = size
+        self.pixel_format = pixel_format
+        command = [
+            ffmpeg_binary, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", pixel_format, "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-c:v", codec, "-threads", str(threads),
+        ]
+        if preset:
+            command += ["-preset", preset]
+        if tune:
+            command += ["-tune", tune]
+        if gop:
+            command += ["-g", str(gop)]
+        command += ["-pix_fmt", "yuv420p", output_file]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        if self.pixel_format == "yuv420p":
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+        self.process.stdin.write(frame.data)
+
+    def release(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise subprocess.CalledProcessError(self.process.returncode, self.process.args)
+
+
+# Function to draw test frames that look like the countdowns of 018-circulitos.py:
+# one frame per second with the rings and the MM:SS text
+def draw_test_frames(seconds):
+    frames = []
+    center = (width // 2, height // 2)
+    outer_radius = int((height / 2) * 0.9)
+    for remaining_seconds in range(seconds, 0, -1):
+        minutes, secs = remaining_seconds // 60, remaining_seconds % 60
+        frame = np.full((height, width, 3), 0, dtype=np.uint8)
+        for ring_offset, angle, color in [(2, minutes * 6, (0, 255, 0)), (4, secs * 6, (255, 0, 0))]:
+            radius = outer_radius - 50 * ring_offset
+            cv2.circle(frame, center, radius, (230, 230, 230), 2)
+            if angle > 0:
+                cv2.ellipse(frame, center, (radius, radius), -90, 0, angle, color, 50)
+        time_str = f"{minutes:02}:{secs:02}"
+        text_size = cv2.getTextSize(time_str, cv2.FONT_HERSHEY_SIMPLEX, 4, 16)[0]
+        cv2.putText(frame, time_str, (center[0] - text_size[0] // 2, center[1] + text_size[1] // 2), cv2.FONT_HERSHEY_SIMPLEX, 4, (255, 255, 255), 16)
+        frames.append(frame)
+    return frames
+
+
+# Video properties (same as the countdown scripts)
+width, height = 1920, 1080
+fps = 60
+
+# Seconds of countdown written by every test
+test_seconds = 20
+
+ffmpeg_binary = shutil.which("ffmpeg")
+
+# Writers to compare: (name, backend, settings)
+writers = [
+    ("cv2 mp4v", "cv2", {}),
+    ("ffmpeg mpeg4 bgr24", "ffmpeg", {"codec": "mpeg4", "preset": None, "pixel_format": "bgr24"}),
+    ("ffmpeg libx264 ultrafast bgr24", "ffmpeg", {"codec": "libx264", "preset": "ultrafast", "pixel_format": "bgr24"}),
+    ("ffmpeg libx264 ultrafast yuv420p", "ffmpeg", {"codec": "libx264", "preset": "ultrafast", "pixel_format": "yuv420p"}),
+    ("ffmpeg libx264 veryfast yuv420p", "ffmpeg", {"codec": "libx264", "preset": "veryfast", "pixel_format": "yuv420p"}),
+    ("ffmpeg libx264 veryfast stillimage g600", "ffmpeg", {"codec": "libx264", "preset": "veryfast", "pixel_format": "yuv420p", "tune": "stillimage", "gop": 600}),
+    ("ffmpeg libx264 medium stillimage g600", "ffmpeg", {"codec": "libx264", "preset": "medium", "pixel_format": "yuv420p", "tune": "stillimage", "gop": 600}),
+]
+
+if __name__ == "__main__":
+    os.makedirs("benchmark", exist_ok=True)
+    cv2.setNumThreads(1)
+
+    if ffmpeg_binary is None:
+        print("ffmpeg not found, only the cv2 writer will be measured.")
+
+    print(f"Drawing {test_seconds} test frames...")
+    frames = draw_test_frames(test_seconds)
+    total_frames = test_seconds * fps
+
+    print(f"{'Writer':<42}{'Encode fps':>12}{'Realtime':>10}{'MB/hour':>12}")
+    for name, backend, settings in writers:
+        if backend == "ffmpeg" and ffmpeg_binary is None:
+            continue
+
+        output_file = f"benchmark/{name.replace(' ', '_')}.mp4"
+        start = time.perf_counter()
+
+        if backend == "ffmpeg":
+            out = FFmpegWriter(output_file, fps, (width, height), **settings)
+        else:
+            out = cv2.VideoWriter(output_file, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+
+        # Every frame is written fps times, like the hold render mode
+        for frame in frames:
+            for _ in range(fps):
+                out.write(frame)
+        out.release()
+
+        elapsed = time.perf_counter() - start
+        megabytes_per_hour = os.path.getsize(output_file) / test_seconds * 3600 / 1e6
+        print(f"{name:<42}{total_frames / elapsed:>12.1f}{total_frames / elapsed / fps:>9.1f}x{megabytes_per_hour:>12.1f}")
+        os.remove(output_file)
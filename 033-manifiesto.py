@@ -0,0 +1,886 @@
+import cv2
+import numpy as np
+import hashlib
+import json
+import os
+import multiprocessing
+import shutil
+import subprocess
+import keyboard  # New import for detecting key presses from the console
+from datetime import datetime, timedelta
+
+
+# Function to precompute the result of blending a color with the given opacity over every
+# 0-255 channel value. cv2.addWeighted itself is used, so looking values up in this table
+# gives the same result as blending a full overlay image.
+def blend_table(color, opacity):
+    values = np.repeat(np.arange(256, dtype=np.uint8)[:, np.newaxis], 3, axis=1)
+    overlay = np.empty_like(values)
+    overlay[:] = color
+    return cv2.addWeighted(overlay, opacity, values, 1 - opacity, 0)
+
+
+# Function to compute the color of every combination of layers of a theme.
+# The layers are stacked in the order the previous scripts drew them: background, dial,
+# semi-transparent rings blended with the same tables as before, end circle and text.
+def theme_palette(theme, opacity):
+    ring_tables = [
+        (hour_layer, blend_table(theme["hour_color"], opacity)),
+        (minute_layer, blend_table(theme["minute_color"], opacity)),
+        (second_layer, blend_table(theme["second_color"], opacity)),
+    ]
+    palette = np.empty((64, 3), dtype=np.uint8)
+    for layers in range(64):
+        color = np.array(theme["tick_color"] if layers & tick_layer else theme["background_color"], dtype=np.uint8)
+        for layer, table in ring_tables:
+            if layers & layer:
+                color = table[color, np.arange(3)]
+        if layers & dot_layer:
+            color = theme["dot_color"]
+        if layers & text_layer:
+            color = theme["font_color"]
+        palette[layers] = color
+    return palette
+
+
+# Function to add a ring with a filled circle at the end to the layer image, only inside rect.
+# The shapes are rasterized in full frame coordinates on the scratch mask (so they have exactly
+# the same pixels as when drawn on the whole frame), the ring layer is added to the masked pixels
+# of the rectangle and the mask is cleared again by drawing the shapes with 0.
+# The circle is opaque, so its pixels only keep the end circle layer.
+def draw_ring_layer(layers, mask, rect, center, radius, start_angle, end_angle, layer, thickness):
+    x0, y0, x1, y1 = rect
+    roi = layers[y0:y1, x0:x1]
+    roi_mask = mask[y0:y1, x0:x1]
+
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 255, thickness)
+    roi[roi_mask > 0] |= layer
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 0, thickness)
+
+    # Calculate the position of the small white circle at the end of the arc
+    end_radian = np.radians(start_angle + end_angle)
+    circle_center = (
+        int(center[0] + radius * np.cos(end_radian)),
+        int(center[1] + radius * np.sin(end_radian))
+    )
+    # Draw the small circle
+    cv2.circle(mask, circle_center, 10, 255, -1)  # Radius of 10 pixels, filled circle
+    roi[roi_mask > 0] = dot_layer
+    cv2.circle(mask, circle_center, 10, 0, -1)
+
+
+# Function to draw the static dial: thin rings with their division marks.
+# The marks never change during a video, so this is called once per video on the background.
+def draw_tick_dial(image, center, outer_radius, ring_thickness, start_angle, color, thickness):
+    segments = []
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, color, thickness)
+
+        # Angles and mark lengths of every division at once (major marks every 5 divisions)
+        index = np.arange(divisions)
+        angles = np.radians(start_angle + index * (360 / divisions))
+        line_length = np.where(index % 5 == 0, 10, 5)
+        cos, sin = np.cos(angles), np.sin(angles)
+
+        # Inside marks go from (radius - length) to radius, outside marks from radius to (radius + length)
+        inner = radius - line_length
+        outer = radius + line_length
+        points = [
+            np.stack([center[0] + r * cos, center[1] + r * sin], axis=-1).astype(np.int32)
+            for r in (inner, radius, outer)
+        ]
+        segments.extend(np.stack([points[0], points[1]], axis=1))
+        segments.extend(np.stack([points[1], points[2]], axis=1))
+
+    # Draw all the marks with a single call
+    cv2.polylines(image, segments, False, color, thickness)
+
+
+# Function to rasterize the countdown characters once for a font, scale and thickness.
+# Each glyph is kept as a mask cropped to its strokes, the offset of that crop from the
+# text origin and the advance cv2.putText moves to the right after the character.
+def build_glyph_atlas(font, font_scale, thickness, characters="0123456789:"):
+    (_, text_height), baseline = cv2.getTextSize(characters, font, font_scale, thickness)
+    margin = int(32 * font_scale) + thickness  # Script fonts draw well outside their text box
+
+    atlas = {}
+    for char in characters:
+        advance = cv2.getTextSize(char, font, font_scale, thickness)[0][0] - thickness
+        canvas = np.zeros((text_height + baseline + 2 * margin, advance + 2 * margin), dtype=np.uint8)
+        origin = (margin, margin + text_height)
+        cv2.putText(canvas, char, origin, font, font_scale, 255, thickness)
+
+        ys, xs = np.nonzero(canvas)
+        top, left = ys.min(), xs.min()
+        mask = canvas[top:ys.max() + 1, left:xs.max() + 1] > 0
+        atlas[char] = (mask, left - origin[0], top - origin[1], advance)
+    return atlas
+
+
+# Function to compute the x position of every character of a time string centered on center_x
+# (the same positions cv2.getTextSize and cv2.putText would give the whole string)
+def glyph_positions(time_str, atlas, center_x, thickness):
+    text_width = sum(atlas[char][3] for char in time_str) + thickness
+    x = center_x - text_width // 2
+    positions = []
+    for char in time_str:
+        positions.append(x)
+        x += atlas[char][3]
+    return positions
+
+
+# Function to draw a time string by copying the cached glyph masks onto the image.
+# origin is the position of the image inside the full frame, so the text can be drawn
+# into a region of the frame; glyphs are clipped to the image.
+def draw_glyph_text(image, time_str, positions, text_y, atlas, color, origin=(0, 0)):
+    height, width = image.shape[:2]
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        top, left = text_y + offset_y - origin[1], x + offset_x - origin[0]
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + mask.shape[0], height), min(left + mask.shape[1], width)
+        if y0 < y1 and x0 < x1:
+            image[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - left:x1 - left]] = color
+
+
+# Function to get the bounding rectangle (x0, y0, x1, y1) of a time string drawn from the atlas
+def glyph_text_rect(time_str, positions, text_y, atlas):
+    x0 = y0 = float("inf")
+    x1 = y1 = float("-inf")
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        x0, y0 = min(x0, x + offset_x), min(y0, text_y + offset_y)
+        x1, y1 = max(x1, x + offset_x + mask.shape[1]), max(y1, text_y + offset_y + mask.shape[0])
+    return (x0, y0, x1, y1)
+
+
+# Function to get the bounding rectangle of the part of a ring between two angles
+# (in degrees from start_angle), padded to include the ring thickness and the end circle
+def arc_rect(center, radius, start_angle, angle_from, angle_to, pad):
+    first, last = start_angle + angle_from, start_angle + angle_to
+    # The arc reaches its extremes at its ends and wherever it crosses an axis
+    angles = np.radians([first, last] + [90 * k for k in range(-(-first // 90), last // 90 + 1)])
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
+    return (int(xs.min()) - pad, int(ys.min()) - pad, int(xs.max()) + pad + 1, int(ys.max()) + pad + 1)
+
+
+# Function to check if two rectangles overlap
+def rects_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# Function to clip rectangles to the frame and merge the ones that overlap,
+# so no area of the frame is restored and redrawn twice
+def merge_rects(rects, width, height):
+    merged = []
+    for rect in rects:
+        rect = (max(rect[0], 0), max(rect[1], 0), min(rect[2], width), min(rect[3], height))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            continue
+        i = 0
+        while i < len(merged):
+            if rects_overlap(merged[i], rect):
+                other = merged.pop(i)
+                rect = (min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3]))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+# Video writer that pipes raw frames to an ffmpeg process, with the same write() and release()
+# methods as cv2.VideoWriter. Frames are sent as BGR (bgr24) or converted to planar YUV 4:2:0
+# (yuv420p) first, which halves the bytes going through the pipe and saves ffmpeg the conversion.
+# fps is the rate of the written frames and display_fps the frame rate players should see.
+# keyframe_seconds are seconds from the start of the file that must start with a keyframe.
+class FFmpegWriter:
+    def __init__(self, output_file, fps, size, display_fps, keyframe_seconds=()):
+        width, height = size
+        self.pixel_format = pipe_pixel_format
+        output_fps = display_fps if frame_rate_mode == "content_cfr" else fps
+        command = [
+            ffmpeg_binary, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", self.pixel_format, "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-c:v", ffmpeg_codec, "-preset", ffmpeg_preset, "-tune", ffmpeg_tune,
+            "-g", str(gop_seconds * output_fps), "-threads", str(opencv_threads_per_worker),
+            "-pix_fmt", "yuv420p",
+        ]
+        if output_fps != fps:
+            # ffmpeg repeats every frame up to the display frame rate before the encoder
+            command += ["-r", str(output_fps)]
+        if keyframe_seconds:
+            # IDR keyframes, so the video can be cut there without re-encoding
+            command += ["-force_key_frames", ",".join(str(second) for second in keyframe_seconds), "-forced-idr", "1"]
+        command.append(output_file)
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        if self.pixel_format == "yuv420p":
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+        self.process.stdin.write(frame.data)
+
+    def release(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise subprocess.CalledProcessError(self.process.returncode, self.process.args)
+
+
+# Function to open a video writer with the selected backend.
+# The cv2.VideoWriter (mp4v) backend is used when ffmpeg is not found, it always stores the
+# frames at the rate they are written.
+def open_video_writer(output_file, fps, size, display_fps, keyframe_seconds=()):
+    if writer_backend == "ffmpeg" and ffmpeg_binary:
+        return FFmpegWriter(output_file, fps, size, display_fps, keyframe_seconds)
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    return cv2.VideoWriter(output_file, fourcc, fps, size)
+
+
+# Function to get the output file path of a video (the hour series is named by hours, like 013-skip.py)
+def video_path(font_index, duration, variant):
+    if series == "hours":
+        return f"render/countdown_timer_{duration // 3600}h_font_{font_index}_{variant}.mp4"
+    return f"render/countdown_timer_{duration}s_font_{font_index}_{variant}.mp4"
+
+
+# Function to get the number of time segments a video is split into
+def segment_count(duration):
+    if segment_seconds is None:
+        return 1
+    return -(-duration // segment_seconds)
+
+
+# Function to get the file path of one time segment of a video
+def segment_path(font_index, duration, variant, segment_index):
+    name = os.path.splitext(os.path.basename(video_path(font_index, duration, variant)))[0]
+    return f"render/segments/{name}_{segment_index:04}.mp4"
+
+
+# Function to get the path a file is written to before it is complete.
+# It is renamed to its final path when it is finished, so an interrupted render never leaves
+# a truncated file with the final name.
+def part_path(path):
+    root, extension = os.path.splitext(path)
+    return root + ".part" + extension
+
+
+# Function to join the segments of a video into its output file without re-encoding.
+# Every segment is a separate video file, so it starts on a keyframe and the ffmpeg concat
+# demuxer can copy the streams one after the other. A single segment is just renamed.
+def join_segments(segment_files, output_file):
+    if len(segment_files) == 1:
+        os.replace(segment_files[0], output_file)
+        return
+
+    list_file = output_file + ".txt"
+    with open(list_file, "w") as f:
+        for segment_file in segment_files:
+            f.write(f"file '{os.path.abspath(segment_file)}'\n")
+
+    subprocess.run(
+        [ffmpeg_binary, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_file, "-c", "copy", part_path(output_file)],
+        check=True,
+    )
+    os.replace(part_path(output_file), output_file)
+
+    os.remove(list_file)
+    for segment_file in segment_files:
+        os.remove(segment_file)
+
+
+# Function to cut the last seconds of a master video into another video without re-encoding.
+# The master must have a keyframe at start_second.
+def cut_video(master_file, output_file, start_second, seconds):
+    subprocess.run(
+        [ffmpeg_binary, "-y", "-loglevel", "error", "-ss", str(start_second), "-i", master_file, "-t", str(seconds), "-c", "copy", "-avoid_negative_ts", "make_zero", part_path(output_file)],
+        check=True,
+    )
+    os.replace(part_path(output_file), output_file)
+
+
+# Function to get every parameter that changes the pixels or the encoding of a video
+def video_spec(font_index, duration, variant):
+    return {
+        "duration": duration,
+        "series": series,
+        "size": [width, height],
+        "fps": fps,
+        "frame_rate_mode": frame_rate_mode,
+        "font": fonts[font_index],
+        "font_scale": font_scale,
+        "thickness": thickness,
+        "ring_thickness": ring_thickness,
+        "opacity": opacity,
+        "thin_ring_thickness": thin_ring_thickness,
+        "start_angle": start_angle,
+        "theme": themes[variant],
+        "writer": [writer_backend, pipe_pixel_format, ffmpeg_codec, ffmpeg_preset, ffmpeg_tune, gop_seconds] if writer_backend == "ffmpeg" and ffmpeg_binary else ["cv2", "mp4v"],
+    }
+
+
+# Function to get the hash of the spec of a video, which identifies its content
+def spec_hash(font_index, duration, variant):
+    spec = json.dumps(video_spec(font_index, duration, variant), sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+# Function to load a JSON file of the render (the checkpoint or the manifest), or an empty one.
+# The checkpoint has:
+#   "segments"  - for every unfinished video, the finished segments and the spec hash, segment
+#                 length and keyframe seconds they were rendered with
+#   "keyframes" - for every finished video, the seconds where it has keyframes to cut from
+# The manifest has the spec hash, size and frame count of every finished video.
+def load_json(path, empty):
+    if not os.path.exists(path):
+        return empty
+    with open(path) as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as error:
+            print(f"File {path} is damaged ({error}). Starting with an empty one.")
+            return empty
+
+
+# Function to save a JSON file of the render, replacing the previous one in a single step
+# so a crash while writing it keeps the old one. The new one is flushed to disk first
+# so a power cut right after the replace cannot leave an empty file in its place.
+def save_json(path, data):
+    with open(part_path(path), "w") as f:
+        json.dump(data, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(part_path(path), path)
+
+
+# Function to record a finished video in the manifest with its spec hash, size and frame count
+def record_video(manifest, font_index, duration, variant):
+    output_file = video_path(font_index, duration, variant)
+    capture = cv2.VideoCapture(output_file)
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    manifest[output_file] = {
+        "spec_hash": spec_hash(font_index, duration, variant),
+        "size": os.path.getsize(output_file),
+        "frames": frame_count,
+    }
+    save_json(manifest_file, manifest)
+    print(f"Video creation complete and saved in the 'render' folder! Font {font_index}, Duration: {duration} seconds, Variant: {variant}")
+
+
+# Function to join a video whose segments are all rendered, record it in the checkpoint and the
+# manifest and cut the shorter countdowns of trimmed_durations from the end of it
+def finish_video(font_index, duration, variant, trimmed_durations, checkpoint, manifest):
+    output_file = video_path(font_index, duration, variant)
+    segment_files = [segment_path(font_index, duration, variant, segment_index) for segment_index in range(segment_count(duration))]
+    join_segments(segment_files, output_file)
+
+    entry = checkpoint["segments"].pop(output_file)
+    checkpoint["keyframes"][output_file] = entry["cut_seconds"]
+    save_json(checkpoint_file, checkpoint)
+    record_video(manifest, font_index, duration, variant)
+
+    for trimmed_duration in trimmed_durations:
+        cut_video(output_file, video_path(font_index, trimmed_duration, variant), duration - trimmed_duration, trimmed_duration)
+        record_video(manifest, font_index, trimmed_duration, variant)
+
+
+# Function run by each worker process when it starts: every process draws and encodes a
+# whole segment, so OpenCV is limited to a few threads to not oversubscribe the cores
+def init_worker():
+    cv2.setNumThreads(opencv_threads_per_worker)
+
+
+# Function to render one time segment of the videos of a duration in several fonts and variants,
+# run in a worker process. font_variants holds (font index, variants) pairs.
+# The rings and the dial do not depend on the font, so every second they are drawn once into a
+# shared layer image; the layer image of each font is that one plus its text, and each variant
+# is colored from it with the palette of its theme.
+# cut_seconds are the seconds of the whole video where shorter videos will be cut from it.
+def render_segment(duration, font_variants, segment_index, cut_seconds=()):
+    # Every (font, variant) video rendered by this job
+    videos = [(font_index, variant) for font_index, job_variants in font_variants for variant in job_variants]
+    output_files = [segment_path(font_index, duration, variant, segment_index) for font_index, variant in videos]
+
+    # Rate of the frames written to the video: one per second (the rate the content changes)
+    # or the display frame rate
+    video_fps = fps if frame_rate_mode == "display" else 1
+
+    # Colors of every layer combination for the theme of each variant
+    palettes = {variant: theme_palette(themes[variant], opacity) for _, variant in videos}
+
+    # Ring properties
+    center = (width // 2, height // 2)
+    outer_radius = int((height / 2) * 0.9)  # Outer ring radius
+
+    # Create a background layer image with the static dial already drawn on it.
+    # Each pixel of a layer image holds the layers that cover it as bits.
+    background = np.zeros((height, width), dtype=np.uint8)
+    draw_tick_dial(background, center, outer_radius, ring_thickness, start_angle, tick_layer, thin_ring_thickness)
+
+    # Text of every font, as [font index, glyph atlas, text baseline, positions per format or None,
+    # previous text rectangle]. The digits and the colon are rasterized once per font.
+    # When all digits of a font have the same advance every MM:SS (or HH:MM:SS) string has the
+    # same width, so its glyph positions are computed once per format and reused.
+    texts = []
+    for font_index, _ in font_variants:
+        atlas = build_glyph_atlas(fonts[font_index], font_scale, thickness)
+        text_height = cv2.getTextSize("0", fonts[font_index], font_scale, thickness)[0][1]  # Same for any string
+        fixed_width = len({atlas[digit][3] for digit in "0123456789"}) == 1
+        texts.append([font_index, atlas, center[1] + text_height // 2, {} if fixed_width else None, None])
+
+    # Scratch mask where the rings are rasterized before being added to the layer image
+    ring_mask = np.zeros((height, width), dtype=np.uint8)
+
+    # Padding around a ring arc: half the ring thickness or the end circle radius (10)
+    ring_pad = max(ring_thickness // 2, 10) + 2
+
+    # The ring layer image, the layer image of every font and the frame of every video are kept
+    # between seconds and only their changed rectangles are redrawn
+    ring_layers = background.copy()
+    font_layers = [background.copy() for _ in font_variants]
+    frames = [[np.empty((height, width, 3), dtype=np.uint8) for _ in job_variants] for _, job_variants in font_variants]
+    previous_rings = None
+    previous_time_str = None
+
+    # Frames of this segment (the whole video when it is not split)
+    first_second = 0 if segment_seconds is None else segment_index * segment_seconds
+    last_second = duration if segment_seconds is None else min(first_second + segment_seconds, duration)
+    first_frame, last_frame = first_second * video_fps, last_second * video_fps
+    total_frames = last_frame - first_frame
+
+    # Create a video writer for every video with the selected backend, with keyframes where the shorter videos start
+    keyframe_seconds = [second - first_second for second in cut_seconds if first_second <= second < last_second]
+    writers = [open_video_writer(part_path(output_file), video_fps, (width, height), fps, keyframe_seconds) for output_file in output_files]
+
+    # Start time
+    start_time = datetime.now()
+
+    # Second shown by the last drawn frame (None forces the first frame to be drawn)
+    rendered_seconds = None
+
+    for frame_count in range(first_frame, last_frame):
+        # Calculate the remaining time in seconds
+        remaining_seconds = duration - (frame_count // video_fps)
+
+        # In hold mode a frame is only drawn when the displayed second changes,
+        # then the same frame is written to the video for the rest of that second
+        if render_mode == "per_frame" or remaining_seconds != rendered_seconds:
+            rendered_seconds = remaining_seconds
+
+            # Calculate the time in MM:SS format (handling hours if needed)
+            hours = remaining_seconds // 3600
+            minutes = (remaining_seconds % 3600) // 60
+            seconds = remaining_seconds % 60
+            if hours > 0:
+                time_str = two_digits[hours] + ":" + two_digits[minutes] + ":" + two_digits[seconds]
+            else:
+                time_str = two_digits[minutes] + ":" + two_digits[seconds]
+
+            # Calculate angles for the rings (full circle is 360 degrees)
+            if duration >= 3600 and hours > 0:
+                hour_angle = int(360 * (hours / (duration // 3600 if duration // 3600 <= 24 else 24)))
+            else:
+                hour_angle = 0  # No hour ring for durations under 1 hour or if hours is 0
+
+            minute_angle = int(360 * (minutes / 60)) if minutes > 0 else 0
+            second_angle = int(360 * (seconds / 60)) if seconds > 0 else 0
+
+            # Rings as (radius, layer, angle), a ring with angle 0 is not drawn
+            rings = [
+                (outer_radius, hour_layer, hour_angle),  # Hour ring
+                (outer_radius - ring_thickness * 2, minute_layer, minute_angle),  # Minute ring
+                (outer_radius - ring_thickness * 4, second_layer, second_angle),  # Second ring
+            ]
+
+            # Find the rectangles of the rings that changed since the previously drawn frame:
+            # the part of every ring between its old and new angle.
+            # OpenCV draws arcs as polylines with a point every 5 degrees, so the segment
+            # before the smaller angle can change too and is included.
+            full_redraw = render_mode == "per_frame" or previous_rings is None
+            if full_redraw:
+                ring_rects = [(0, 0, width, height)]
+            else:
+                ring_rects = []
+                for (radius, _, angle), (_, _, previous_angle) in zip(rings, previous_rings):
+                    if angle != previous_angle:
+                        ring_rects.append(arc_rect(center, radius, start_angle, min(angle, previous_angle) - 5, max(angle, previous_angle), ring_pad))
+            text_changed = time_str != previous_time_str
+            previous_rings, previous_time_str = rings, time_str
+
+            # Restore every changed ring rectangle from the background (the dial is already on it)
+            # and redraw only the rings that overlap it, once for all the fonts
+            for rect in merge_rects(ring_rects, width, height):
+                x0, y0, x1, y1 = rect
+                ring_layers[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+
+                for radius, layer, angle in rings:
+                    if angle > 0 and rects_overlap(arc_rect(center, radius, start_angle, 0, angle, ring_pad), rect):
+                        draw_ring_layer(ring_layers, ring_mask, rect, center, radius, start_angle, angle, layer, ring_thickness)
+
+            for text, layers, font_frames, (_, job_variants) in zip(texts, font_layers, frames, font_variants):
+                font_index, atlas, text_y, format_positions, previous_text_rect = text
+
+                # Center the countdown timer on the entire image
+                positions = None if format_positions is None else format_positions.get(len(time_str))
+                if positions is None:
+                    positions = glyph_positions(time_str, atlas, center[0], thickness)
+                    if format_positions is not None:
+                        format_positions[len(time_str)] = positions
+                text_rect = glyph_text_rect(time_str, positions, text_y, atlas)
+                text[4] = text_rect
+
+                # The changed rectangles of this font are the ring ones and its old and new text
+                dirty_rects = list(ring_rects)
+                if text_changed and not full_redraw:
+                    dirty_rects.append(previous_text_rect)
+                    dirty_rects.append(text_rect)
+
+                # Copy every dirty rectangle from the ring layers and draw the text over it
+                for rect in merge_rects(dirty_rects, width, height):
+                    x0, y0, x1, y1 = rect
+                    roi = layers[y0:y1, x0:x1]
+                    roi[:] = ring_layers[y0:y1, x0:x1]
+
+                    # Draw the countdown timer from the glyph atlas (the text is opaque and on top of everything)
+                    if rects_overlap(text_rect, rect):
+                        draw_glyph_text(roi, time_str, positions, text_y, atlas, text_layer, (x0, y0))
+
+                    # Color the rectangle of every variant by looking its layers up in the theme palette
+                    for frame, variant in zip(font_frames, job_variants):
+                        np.take(palettes[variant], roi, axis=0, out=frame[y0:y1, x0:x1])
+
+        # Calculate and print statistics every second of video
+        if frame_count % video_fps == 0:
+            time_passed = timedelta(seconds=(duration - remaining_seconds))
+            time_remaining = timedelta(seconds=remaining_seconds)
+            percentage_complete = ((frame_count - first_frame) / total_frames) * 100
+            estimated_finish = start_time + timedelta(seconds=remaining_seconds)
+
+            stats_str = (
+                f"Time Passed: {time_passed}\n"
+                f"Time Remaining: {time_remaining}\n"
+                f"Estimated Finish: {estimated_finish.strftime('%H:%M:%S')}\n"
+                f"Completion: {percentage_complete:.2f}%"
+            )
+
+            # Print statistics to the console
+            print(f"Duration {duration}, Fonts {', '.join(str(font_index) for font_index, _ in font_variants)}, Videos {len(videos)}, Segment {segment_index}, Frame: {frame_count - first_frame}/{total_frames}")
+            print(stats_str)
+            print('-' * 40)
+
+        # Write the frame of every video
+        for out, frame in zip(writers, (frame for font_frames in frames for frame in font_frames)):
+            out.write(frame)
+
+    # Release the video writers and give the finished segments their final names
+    for out, output_file in zip(writers, output_files):
+        out.release()
+        os.replace(part_path(output_file), output_file)
+
+    return duration, font_variants, segment_index
+
+
+# Function to render a segment task tuple, used with the process pool
+def render_task(task):
+    return render_segment(*task)
+
+
+# List of available fonts in OpenCV
+fonts = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX_SMALL,
+    cv2.FONT_HERSHEY_SCRIPT_SIMPLEX,
+    cv2.FONT_HERSHEY_SCRIPT_COMPLEX,
+]
+
+# Series of countdowns to render:
+#   "intervals" - the time intervals from 10 seconds to 60 minutes of 018-circulitos.py
+#   "hours"     - the 1 to 10 hour countdowns of 00-fuente grande.py, 008-variaciones.py and 013-skip.py
+series = "intervals"
+
+if series == "hours":
+    durations = [3600 * hora for hora in range(1, 11)]
+else:
+    # Time intervals for the countdowns
+    durations = [
+        10, 20, 30,  # 10, 20, 30 seconds
+        *[60 * i for i in range(1, 11)],  # 1-10 minutes
+        *[60 * i for i in range(10, 61, 5)]  # 10-60 minutes (every 5 minutes)
+    ]
+
+# Video properties
+width, height = 1920, 1080
+fps = 60
+
+# Define a smaller font scale and thickness for the text
+font_scale = 4  # Smaller text for the countdown
+thickness = 16  # Slightly reduced thickness for countdown
+
+# Ring properties
+ring_thickness = 50
+opacity = 0.9  # Semi-transparent rings (90% opacity, 10% transparency)
+thin_ring_thickness = 2  # Thin rings for the divisions
+
+# Rotate the rings 90 degrees counterclockwise by adding 90 degrees to the start angle
+start_angle = -90
+
+# Two digit strings "00".."99", so the time string is not formatted for every frame
+two_digits = [f"{i:02}" for i in range(100)]
+
+# Render mode:
+#   "hold"      - draw one frame per displayed second and write it for the whole second (like 001-prueba.py);
+#                 only the rectangles that changed since the previous second are redrawn
+#   "per_frame" - redraw every single frame in full (previous behaviour, useful to compare outputs)
+render_mode = "hold"
+
+# Layers of the countdown, stored as bits in every pixel of the layer image
+tick_layer = 1  # Thin rings and division marks
+hour_layer = 2
+minute_layer = 4
+second_layer = 8
+dot_layer = 16  # Circle at the end of a ring
+text_layer = 32
+
+# Color themes. A new theme only needs its palette, the countdown is drawn once for all of them.
+themes = {
+    "light_bg": {
+        "background_color": (255, 255, 255),  # White background
+        "font_color": (0, 0, 0),  # Black font
+        "tick_color": (230, 230, 230),  # Grey
+        "hour_color": (0, 0, 255),  # Red
+        "minute_color": (0, 255, 0),  # Green
+        "second_color": (255, 0, 0),  # Blue
+        "dot_color": (255, 255, 255),  # White
+    },
+    "dark_bg": {
+        "background_color": (0, 0, 0),  # Black background
+        "font_color": (255, 255, 255),  # White font
+        "tick_color": (230, 230, 230),
+        "hour_color": (0, 0, 255),
+        "minute_color": (0, 255, 0),
+        "second_color": (255, 0, 0),
+        "dot_color": (255, 255, 255),
+    },
+}
+
+# Themes rendered for every font and duration
+variants = ["light_bg", "dark_bg"]
+
+# Fonts rendered together by one job, sharing the drawing of the rings. Every font and variant
+# of a job has its own frame and video encoder open, lower this to use less memory per worker.
+# None groups as many fonts as possible while there are still at least as many segment tasks as
+# worker processes, so sharing the rings never leaves cores idle.
+fonts_per_job = None
+
+# Worker processes rendering segments at the same time, and OpenCV threads for each of them
+opencv_threads_per_worker = 1
+workers = max(1, (os.cpu_count() or 1) // opencv_threads_per_worker)
+
+# Long videos are split in segments of this many seconds (10 minutes) rendered in parallel
+# and joined with ffmpeg. Without ffmpeg every video is rendered in one piece.
+ffmpeg_binary = shutil.which("ffmpeg")
+segment_seconds = 600 if ffmpeg_binary else None
+
+# Video writer backend:
+#   "ffmpeg" - pipe raw frames to ffmpeg and encode with the settings below (see 027-benchmark escritores.py)
+#   "cv2"    - cv2.VideoWriter with the mp4v codec (previous behaviour, also used when ffmpeg is not found)
+writer_backend = "ffmpeg"
+pipe_pixel_format = "yuv420p"  # "yuv420p" or "bgr24"
+ffmpeg_codec = "libx264"
+ffmpeg_preset = "veryfast"
+ffmpeg_tune = "stillimage"  # The frames are flat colors that barely change
+gop_seconds = 10  # A keyframe every 10 seconds of video
+
+# File where the finished segments are recorded, so an interrupted render continues from them
+checkpoint_file = "render/checkpoint.json"
+
+# File where every finished video is recorded with the hash of its spec, so a video is rendered
+# again when any of its parameters changes
+manifest_file = "render/manifest.json"
+
+# Frame rate mode:
+#   "content"     - encode one frame per second, the rate the countdown changes, so the encoder
+#                   gets 60 times fewer frames; the result is a constant 1 fps video
+#   "content_cfr" - send one frame per second to ffmpeg, which repeats it up to the display frame
+#                   rate before encoding, for players that need a constant 60 fps stream
+#   "display"     - write every frame at the display frame rate (previous behaviour)
+frame_rate_mode = "content"
+
+
+if __name__ == "__main__":
+    # Ensure the "render" folder exists
+    os.makedirs("render", exist_ok=True)
+
+    if ffmpeg_binary is None:
+        print("ffmpeg not found, videos will be rendered without splitting them in segments.")
+    os.makedirs("render/segments", exist_ok=True)
+
+    checkpoint = load_json(checkpoint_file, {"segments": {}, "keyframes": {}})
+    manifest = load_json(manifest_file, {})
+
+    # Every (font, duration, variant) combination is a video, except the videos that already exist
+    # with the same spec. A video is rendered again when its file is not in the manifest (it was
+    # not made by this script), its spec changed or its file is not the one that was recorded.
+    videos = []
+    for font_index in range(len(fonts)):
+        for duration in durations:
+            for variant in variants:
+                output_file = video_path(font_index, duration, variant)
+
+                # Check if the file already exists
+                if os.path.exists(output_file):
+                    entry = manifest.get(output_file)
+                    if entry is None:
+                        print(f"File {output_file} is not in the manifest. Rendering it again.")
+                    elif entry["spec_hash"] != spec_hash(font_index, duration, variant):
+                        print(f"File {output_file} was rendered with other parameters. Rendering it again.")
+                    elif entry["size"] != os.path.getsize(output_file):
+                        print(f"File {output_file} changed since it was rendered. Rendering it again.")
+                    else:
+                        print(f"File {output_file} already exists. Skipping to next video.")
+                        continue
+
+                videos.append((font_index, duration, variant))
+
+    # Below one hour the hour ring is off, so the last N seconds of a countdown are exactly the same
+    # frames as a countdown of N seconds. With ffmpeg, the longest countdown up to one hour of every
+    # font is rendered as a master and the shorter ones are cut from it without re-encoding.
+    # Masters finished by a previous run are in the checkpoint with the seconds they can be cut at,
+    # so the videos missing from them are cut right away.
+    trimmed_videos = {}
+    if writer_backend == "ffmpeg" and ffmpeg_binary:
+        master_duration = max(duration for duration in durations if duration <= 3600)
+        for video in list(videos):
+            font_index, duration, variant = video
+            master_file = video_path(font_index, master_duration, variant)
+            master_finished = os.path.exists(master_file) and (font_index, master_duration, variant) not in videos
+            if master_finished and master_duration - duration in checkpoint["keyframes"].get(master_file, []):
+                cut_video(master_file, video_path(*video), master_duration - duration, duration)
+                record_video(manifest, *video)
+                videos.remove(video)
+
+    # The variants of a font and duration only differ in their colors, so they are rendered
+    # together by one job: (font, duration) -> variants
+    jobs = {}
+    for font_index, duration, variant in videos:
+        jobs.setdefault((font_index, duration), []).append(variant)
+
+    # The shorter countdowns are cut from the masters rendered now, in the variants the master
+    # is rendered in: (font, master duration) -> [(duration, variant), ...]
+    if writer_backend == "ffmpeg" and ffmpeg_binary:
+        for (font_index, duration), job_variants in list(jobs.items()):
+            master_variants = jobs.get((font_index, master_duration))
+            if duration < master_duration and master_variants:
+                trimmed = trimmed_videos.setdefault((font_index, master_duration), [])
+                trimmed.extend((duration, variant) for variant in job_variants if variant in master_variants)
+                job_variants[:] = [variant for variant in job_variants if variant not in master_variants]
+                if not job_variants:
+                    del jobs[(font_index, duration)]
+
+    # Durations cut from every video (only masters have any): (font, duration, variant) -> [duration, ...]
+    trimmed_durations = {}
+    for (font_index, duration), trimmed in trimmed_videos.items():
+        for trimmed_duration, variant in trimmed:
+            trimmed_durations.setdefault((font_index, duration, variant), []).append(trimmed_duration)
+
+    # The rings do not depend on the font either, so the fonts of a duration are rendered together
+    # (in groups of fonts_per_job): (duration, ((font, variants), ...))
+    fonts_by_duration = {}
+    for (font_index, duration), job_variants in jobs.items():
+        fonts_by_duration.setdefault(duration, []).append((font_index, tuple(job_variants)))
+    group_size = fonts_per_job or max((len(font_variants) for font_variants in fonts_by_duration.values()), default=1)
+    if fonts_per_job is None:
+        while group_size > 1 and sum(-(-len(font_variants) // group_size) * segment_count(duration) for duration, font_variants in fonts_by_duration.items()) < workers:
+            group_size -= 1
+    duration_jobs = []
+    for duration, font_variants in fonts_by_duration.items():
+        for i in range(0, len(font_variants), group_size):
+            duration_jobs.append((duration, tuple(font_variants[i:i + group_size])))
+
+    # Longest jobs first, so the short ones fill the gaps at the end and all the workers finish together.
+    # Every segment of a job is a task; the segments of a job are queued together so its videos can be
+    # joined as soon as possible. Segments recorded in the checkpoint are not rendered again if they
+    # were made with the same segment length and have the keyframes the videos need now.
+    duration_jobs.sort(key=lambda job: job[0], reverse=True)
+    tasks = []
+    pending_segments = {}
+    for duration, font_variants in duration_jobs:
+        cut_seconds = tuple(sorted({
+            duration - trimmed_duration
+            for font_index, _ in font_variants
+            for trimmed_duration, _ in trimmed_videos.get((font_index, duration), [])
+        }))
+
+        finished_segments = {}
+        for font_index, job_variants in font_variants:
+            for variant in job_variants:
+                output_file = video_path(font_index, duration, variant)
+                needed_cut_seconds = {duration - trimmed_duration for trimmed_duration in trimmed_durations.get((font_index, duration, variant), [])}
+                video_hash = spec_hash(font_index, duration, variant)
+                entry = checkpoint["segments"].get(output_file)
+                if entry is None or entry["spec_hash"] != video_hash or entry["segment_seconds"] != segment_seconds or not needed_cut_seconds <= set(entry["cut_seconds"]):
+                    entry = {"spec_hash": video_hash, "segment_seconds": segment_seconds, "cut_seconds": list(cut_seconds), "done": []}
+                else:
+                    # Only the keyframes both the finished segments and the new ones will have
+                    entry["cut_seconds"] = sorted(set(entry["cut_seconds"]) & set(cut_seconds))
+                    entry["done"] = [i for i in entry["done"] if os.path.exists(segment_path(font_index, duration, variant, i))]
+                checkpoint["segments"][output_file] = entry
+                finished_segments[(font_index, variant)] = set(entry["done"])
+                pending_segments[(font_index, duration, variant)] = segment_count(duration) - len(entry["done"])
+
+        # Every segment task renders the videos of the job that do not have that segment yet
+        for segment_index in range(segment_count(duration)):
+            task_font_variants = []
+            for font_index, job_variants in font_variants:
+                missing_variants = tuple(variant for variant in job_variants if segment_index not in finished_segments[(font_index, variant)])
+                if missing_variants:
+                    task_font_variants.append((font_index, missing_variants))
+            if task_font_variants:
+                tasks.append((duration, tuple(task_font_variants), segment_index, cut_seconds))
+    save_json(checkpoint_file, checkpoint)
+
+    # Videos whose segments were all rendered before the previous run stopped are joined now
+    for video, pending in pending_segments.items():
+        if pending == 0:
+            finish_video(*video, trimmed_durations.get(video, []), checkpoint, manifest)
+
+    rendered_count = sum(len(job_variants) for job_variants in jobs.values())
+    trimmed_count = sum(len(trimmed) for trimmed in trimmed_videos.values())
+    print(f"Rendering {rendered_count} videos in {len(duration_jobs)} jobs of {len(tasks)} segments with {workers} worker processes, and cutting {trimmed_count} shorter videos from them")
+
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        results = pool.imap_unordered(render_task, tasks)
+
+        for _ in tasks:
+            # Wait for the next finished segment, checking if the Escape key is pressed via the console
+            while True:
+                if keyboard.is_pressed("esc"):  # Check if "Escape" is pressed
+                    print("Escape key pressed. Terminating the video creation process, the next run continues from the finished segments.")
+                    pool.terminate()
+                    exit()
+
+                try:
+                    duration, font_variants, segment_index = results.next(timeout=0.1)
+                    break
+                except multiprocessing.TimeoutError:
+                    pass
+
+            # Record the finished segment of every video of the task
+            finished_videos = []
+            for font_index, job_variants in font_variants:
+                for variant in job_variants:
+                    checkpoint["segments"][video_path(font_index, duration, variant)]["done"].append(segment_index)
+                    pending_segments[(font_index, duration, variant)] -= 1
+                    if pending_segments[(font_index, duration, variant)] == 0:
+                        finished_videos.append((font_index, duration, variant))
+            save_json(checkpoint_file, checkpoint)
+
+            # Join the videos once all their segments are rendered
+            for video in finished_videos:
+                finish_video(*video, trimmed_durations.get(video, []), checkpoint, manifest)
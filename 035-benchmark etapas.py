@@ -0,0 +1,230 @@
+import cv2
+import numpy as np
+import json
+import os
+import sys
+import time
+
+# keyboard needs administrator rights on some systems, its stage is skipped when it cannot be imported
+try:
+    import keyboard
+except ImportError:
+    keyboard = None
+
+
+# Function to time a stage: it is called until at least min_seconds have passed (and at least
+# 3 times, after one warm-up call) and the average time of a call in nanoseconds is returned
+def time_stage(stage):
+    stage()
+    calls = 0
+    start = time.perf_counter_ns()
+    while True:
+        stage()
+        calls += 1
+        elapsed = time.perf_counter_ns() - start
+        if calls >= 3 and elapsed >= min_seconds * 1e9:
+            return elapsed / calls
+
+
+# Function to draw the dial marks one line at a time, like 018-circulitos.py does for every frame
+def draw_tick_dial_loops(image):
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, thin_ring_color, 2)
+        angle_step = 360 / divisions
+        for i in range(divisions):
+            angle = np.radians(start_angle + i * angle_step)
+            line_length = 10 if i % 5 == 0 else 5
+            for r1, r2 in [(radius - line_length, radius), (radius, radius + line_length)]:
+                p1 = (int(center[0] + r1 * np.cos(angle)), int(center[1] + r1 * np.sin(angle)))
+                p2 = (int(center[0] + r2 * np.cos(angle)), int(center[1] + r2 * np.sin(angle)))
+                cv2.line(image, p1, p2, thin_ring_color, 2)
+
+
+# Function to draw the dial marks with a single polylines call (same as in 020-esfera estatica.py)
+def draw_tick_dial_polylines(image):
+    segments = []
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, thin_ring_color, 2)
+        index = np.arange(divisions)
+        angles = np.radians(start_angle + index * (360 / divisions))
+        line_length = np.where(index % 5 == 0, 10, 5)
+        cos, sin = np.cos(angles), np.sin(angles)
+        points = [
+            np.stack([center[0] + r * cos, center[1] + r * sin], axis=-1).astype(np.int32)
+            for r in (radius - line_length, radius, radius + line_length)
+        ]
+        segments.extend(np.stack([points[0], points[1]], axis=1))
+        segments.extend(np.stack([points[1], points[2]], axis=1))
+    cv2.polylines(image, segments, False, thin_ring_color, 2)
+
+
+# Function to get the time string and ring angles of a frame, like the scripts of every generation
+def countdown_state(frame_count, duration):
+    remaining_seconds = duration - (frame_count // fps)
+    hours = remaining_seconds // 3600
+    minutes = (remaining_seconds % 3600) // 60
+    seconds = remaining_seconds % 60
+    time_str = f"{hours:02}:{minutes:02}:{seconds:02}" if hours > 0 else f"{minutes:02}:{seconds:02}"
+    hour_angle = int(360 * (hours / min(duration // 3600, 24))) if hours > 0 else 0
+    return time_str, hour_angle, int(360 * (minutes / 60)), int(360 * (seconds / 60))
+
+
+# Function to draw a frame like 009-rings.py: opaque rings from angle 0 and big HH:MM:SS text
+def draw_frame_009(frame_count):
+    time_str, hour_angle, minute_angle, second_angle = countdown_state(frame_count, benchmark_duration)
+    frame = background.copy()
+    for offset, angle, color in [(0, hour_angle, (0, 0, 255)), (2, minute_angle, (0, 255, 0)), (4, second_angle, (255, 0, 0))]:
+        radius = 300 - 20 * offset
+        cv2.ellipse(frame, center, (radius, radius), 0, 0, angle, color, 20)
+    text_size = cv2.getTextSize(time_str, font, 8, 12)[0]
+    cv2.putText(frame, time_str, ((width - text_size[0]) // 2, (height + text_size[1]) // 2), font, 8, (255, 255, 255), 12)
+    return frame
+
+
+# Function to draw a frame like 016-rotar 90.py: bigger rings rotated to start at the top
+def draw_frame_016(frame_count):
+    time_str, hour_angle, minute_angle, second_angle = countdown_state(frame_count, benchmark_duration)
+    frame = background.copy()
+    for offset, angle, color in [(0, hour_angle, (0, 0, 255)), (2, minute_angle, (0, 255, 0)), (4, second_angle, (255, 0, 0))]:
+        if angle > 0:
+            radius = outer_radius - ring_thickness * offset
+            cv2.ellipse(frame, center, (radius, radius), start_angle, 0, angle, color, ring_thickness)
+    text_size = cv2.getTextSize(time_str, font, font_scale, thickness)[0]
+    cv2.putText(frame, time_str, (center[0] - text_size[0] // 2, center[1] + text_size[1] // 2), font, font_scale, (255, 255, 255), thickness)
+    return frame
+
+
+# Function to draw a frame like 018-circulitos.py: dial marks, semi-transparent rings blended
+# over the whole frame and a white circle at the end of every ring
+def draw_frame_018(frame_count):
+    time_str, hour_angle, minute_angle, second_angle = countdown_state(frame_count, benchmark_duration)
+    frame = background.copy()
+    draw_tick_dial_loops(frame)
+    for offset, angle, color in [(0, hour_angle, (0, 0, 255)), (2, minute_angle, (0, 255, 0)), (4, second_angle, (255, 0, 0))]:
+        if angle > 0:
+            radius = outer_radius - ring_thickness * offset
+            overlay = frame.copy()
+            cv2.ellipse(overlay, center, (radius, radius), start_angle, 0, angle, color, ring_thickness)
+            cv2.addWeighted(overlay, opacity, frame, 1 - opacity, 0, frame)
+            end_radian = np.radians(start_angle + angle)
+            circle_center = (int(center[0] + radius * np.cos(end_radian)), int(center[1] + radius * np.sin(end_radian)))
+            cv2.circle(frame, circle_center, 10, (255, 255, 255), -1)
+    text_size = cv2.getTextSize(time_str, font, font_scale, thickness)[0]
+    cv2.putText(frame, time_str, (center[0] - text_size[0] // 2, center[1] + text_size[1] // 2), font, font_scale, (255, 255, 255), thickness)
+    return frame
+
+
+# Function to make a stage that draws whole frames of a generation, one frame per call
+def generation_stage(draw_frame):
+    frame_counter = iter(range(10**9))
+    return lambda: draw_frame(next(frame_counter))
+
+
+# Video properties (same as the countdown scripts)
+width, height = 1920, 1080
+fps = 60
+
+# List of available fonts in OpenCV (the generation stages use the first one)
+fonts = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX_SMALL,
+    cv2.FONT_HERSHEY_SCRIPT_SIMPLEX,
+    cv2.FONT_HERSHEY_SCRIPT_COMPLEX,
+]
+font = fonts[0]
+font_scale = 4
+thickness = 16
+center = (width // 2, height // 2)
+outer_radius = int((height / 2) * 0.9)
+ring_thickness = 50
+start_angle = -90
+thin_ring_color = (230, 230, 230)
+opacity = 0.9
+
+# Countdown drawn by the generation stages (with the hour ring) and minimum time of every stage
+benchmark_duration = 2 * 3600
+min_seconds = 0.5
+
+# Baselines of every stage, and how much slower than its baseline a stage can be before it is
+# reported as a regression. Run with --save-baseline to store the current numbers as the baseline.
+# The script exits with status 1 when a stage regressed, so it can gate a build.
+baseline_file = "benchmark/baseline_etapas.json"
+regression_tolerance = 0.2
+
+
+if __name__ == "__main__":
+    os.makedirs("benchmark", exist_ok=True)
+    cv2.setNumThreads(1)
+
+    background = np.zeros((height, width, 3), dtype=np.uint8)
+    frame = background.copy()
+    overlay = background.copy()
+
+    # Stages of the frame loop, as (name, function that runs the stage once per frame)
+    stages = [
+        ("background copy", lambda: background.copy()),
+        ("tick dial, line per mark (018)", lambda: draw_tick_dial_loops(frame)),
+        ("tick dial, single polylines (020)", lambda: draw_tick_dial_polylines(frame)),
+        ("ellipse hour arc 270 deg", lambda: cv2.ellipse(frame, center, (outer_radius, outer_radius), start_angle, 0, 270, (0, 0, 255), ring_thickness)),
+        ("ellipse minute arc 180 deg", lambda: cv2.ellipse(frame, center, (outer_radius - 100, outer_radius - 100), start_angle, 0, 180, (0, 255, 0), ring_thickness)),
+        ("ellipse second arc 354 deg", lambda: cv2.ellipse(frame, center, (outer_radius - 200, outer_radius - 200), start_angle, 0, 354, (255, 0, 0), ring_thickness)),
+        ("overlay copy + addWeighted blend", lambda: cv2.addWeighted(frame.copy(), opacity, frame, 1 - opacity, 0, overlay)),
+    ]
+    for font_index in range(len(fonts)):
+        stages.append((f"getTextSize font {font_index}", lambda font_index=font_index: cv2.getTextSize("01:23:45", fonts[font_index], font_scale, thickness)))
+        stages.append((f"putText font {font_index}", lambda font_index=font_index: cv2.putText(frame, "01:23:45", (600, 600), fonts[font_index], font_scale, (255, 255, 255), thickness)))
+    if keyboard is not None:
+        stages.append(("keyboard.is_pressed", lambda: keyboard.is_pressed("esc")))
+    else:
+        print("keyboard could not be imported, its stage is skipped.")
+
+    writer = cv2.VideoWriter("benchmark/etapas_mp4v.mp4", cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    stages.append(("VideoWriter.write mp4v", lambda: writer.write(frame)))
+
+    # Whole frames of every script generation (drawing only, without writing them)
+    stages += [
+        ("frame 009 rings", generation_stage(draw_frame_009)),
+        ("frame 016 rotated", generation_stage(draw_frame_016)),
+        ("frame 018 circulitos", generation_stage(draw_frame_018)),
+    ]
+
+    save_baseline = "--save-baseline" in sys.argv or not os.path.exists(baseline_file)
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'Stage':<38}{'ns/frame':>14}{'Frames/s':>12}{'Realtime':>10}{'Baseline':>11}")
+    for name, stage in stages:
+        ns = time_stage(stage)
+        results[name] = ns
+
+        change = ""
+        if name in baseline:
+            ratio = ns / baseline[name]
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio > 1 + regression_tolerance:
+                change += " !"
+                regressions.append(name)
+        print(f"{name:<38}{ns:>14,.0f}{1e9 / ns:>12.1f}{1e9 / ns / fps:>9.1f}x{change:>11}")
+
+    writer.release()
+    os.remove("benchmark/etapas_mp4v.mp4")
+
+    if regressions:
+        print(f"{len(regressions)} stages are more than {regression_tolerance:.0%} slower than the baseline: {', '.join(regressions)}")
+    if save_baseline:
+        with open(baseline_file, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline saved in {baseline_file}")
+
+    if regressions:
+        sys.exit(1)
@@ -0,0 +1,1414 @@
+import cv2
+import numpy as np
+import hashlib
+import json
+import os
+import multiprocessing
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import keyboard  # New import for detecting key presses from the console
+from datetime import datetime, timedelta
+
+
+# Function to precompute the result of blending a color with the given opacity over every
+# 0-255 channel value. cv2.addWeighted itself is used, so looking values up in this table
+# gives the same result as blending a full overlay image.
+def blend_table(color, opacity):
+    values = np.repeat(np.arange(256, dtype=np.uint8)[:, np.newaxis], 3, axis=1)
+    overlay = np.empty_like(values)
+    overlay[:] = color
+    return cv2.addWeighted(overlay, opacity, values, 1 - opacity, 0)
+
+
+# Function to compute the color of every combination of layers of a theme.
+# The layers are stacked in the order the previous scripts drew them: background, dial,
+# semi-transparent rings blended with the same tables as before, end circle and text.
+def theme_palette(theme, opacity):
+    ring_tables = [
+        (hour_layer, blend_table(theme["hour_color"], opacity)),
+        (minute_layer, blend_table(theme["minute_color"], opacity)),
+        (second_layer, blend_table(theme["second_color"], opacity)),
+    ]
+    palette = np.empty((64, 3), dtype=np.uint8)
+    for layers in range(64):
+        color = np.array(theme["tick_color"] if layers & tick_layer else theme["background_color"], dtype=np.uint8)
+        for layer, table in ring_tables:
+            if layers & layer:
+                color = table[color, np.arange(3)]
+        if layers & dot_layer:
+            color = theme["dot_color"]
+        if layers & text_layer:
+            color = theme["font_color"]
+        palette[layers] = color
+    return palette
+
+
+# Function to add a ring with a filled circle at the end to the layer image, only inside rect.
+# The shapes are rasterized in full frame coordinates on the scratch mask (so they have exactly
+# the same pixels as when drawn on the whole frame), the ring layer is added to the masked pixels
+# of the rectangle and the mask is cleared again by drawing the shapes with 0.
+# The circle is opaque, so its pixels only keep the end circle layer.
+# The masked operations are done in place with OpenCV, without boolean index arrays.
+def draw_ring_layer(layers, mask, rect, center, radius, start_angle, end_angle, layer, thickness, dot_radius=10):
+    x0, y0, x1, y1 = rect
+    roi = layers[y0:y1, x0:x1]
+    roi_mask = mask[y0:y1, x0:x1]
+
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 255, thickness)
+    cv2.bitwise_or(roi, layer, dst=roi, mask=roi_mask)
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 0, thickness)
+
+    # Calculate the position of the small white circle at the end of the arc
+    end_radian = np.radians(start_angle + end_angle)
+    circle_center = (
+        int(center[0] + radius * np.cos(end_radian)),
+        int(center[1] + radius * np.sin(end_radian))
+    )
+    # Draw the small circle
+    cv2.circle(mask, circle_center, dot_radius, 255, -1)  # Radius of 10 pixels at 1080p, filled circle
+    cv2.bitwise_and(roi, 0, dst=roi, mask=roi_mask)
+    cv2.bitwise_or(roi, dot_layer, dst=roi, mask=roi_mask)
+    cv2.circle(mask, circle_center, dot_radius, 0, -1)
+
+
+# Function to draw the static dial: thin rings with their division marks.
+# The marks never change during a video, so this is called once per video on the background.
+def draw_tick_dial(image, center, outer_radius, ring_thickness, start_angle, color, thickness, mark_length=10):
+    segments = []
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, color, thickness)
+
+        # Angles and mark lengths of every division at once (major marks every 5 divisions)
+        index = np.arange(divisions)
+        angles = np.radians(start_angle + index * (360 / divisions))
+        line_length = np.where(index % 5 == 0, mark_length, mark_length // 2)
+        cos, sin = np.cos(angles), np.sin(angles)
+
+        # Inside marks go from (radius - length) to radius, outside marks from radius to (radius + length)
+        inner = radius - line_length
+        outer = radius + line_length
+        points = [
+            np.stack([center[0] + r * cos, center[1] + r * sin], axis=-1).astype(np.int32)
+            for r in (inner, radius, outer)
+        ]
+        segments.extend(np.stack([points[0], points[1]], axis=1))
+        segments.extend(np.stack([points[1], points[2]], axis=1))
+
+    # Draw all the marks with a single call
+    cv2.polylines(image, segments, False, color, thickness)
+
+
+# Function to lay the countdown out for a video size. The countdown was designed for 1920x1080,
+# so every length is scaled with the shorter side of the frame: the dial keeps its proportions
+# in any aspect ratio, centered on the frame, and 1920x1080 gets exactly the same pixels as before.
+def size_layout(size):
+    width, height = size
+    scale = min(width, height) / 1080
+    return {
+        "size": (width, height),
+        "center": (width // 2, height // 2),
+        "outer_radius": int((min(width, height) / 2) * 0.9),
+        "ring_thickness": max(1, round(ring_thickness * scale)),
+        "thin_ring_thickness": max(1, round(thin_ring_thickness * scale)),
+        "mark_length": max(2, round(10 * scale)),
+        "dot_radius": max(1, round(10 * scale)),
+        "font_scale": font_scale * scale,
+        "thickness": max(1, round(thickness * scale)),
+    }
+
+
+# Function to rasterize the countdown characters once for a font, scale and thickness.
+# Each glyph is kept as a mask cropped to its strokes, the offset of that crop from the
+# text origin and the advance cv2.putText moves to the right after the character. The advance
+# is kept unrounded (the width of the character in font units times the scale), because the font
+# scale of a size can be fractional and cv2.putText only rounds the sum of the advances.
+def build_glyph_atlas(font, font_scale, thickness, characters="0123456789:"):
+    (_, text_height), baseline = cv2.getTextSize(characters, font, font_scale, thickness)
+    margin = int(32 * font_scale) + thickness  # Script fonts draw well outside their text box
+
+    atlas = {}
+    for char in characters:
+        advance = (cv2.getTextSize(char, font, 1, 1)[0][0] - 1) * font_scale
+        canvas = np.zeros((text_height + baseline + 2 * margin, int(advance) + 2 * margin), dtype=np.uint8)
+        origin = (margin, margin + text_height)
+        cv2.putText(canvas, char, origin, font, font_scale, 255, thickness)
+
+        ys, xs = np.nonzero(canvas)
+        top, left = ys.min(), xs.min()
+        mask = canvas[top:ys.max() + 1, left:xs.max() + 1] > 0
+        atlas[char] = (mask, left - origin[0], top - origin[1], advance)
+    return atlas
+
+
+# Function to compute the x position of every character of a time string centered on center_x
+# (the same positions cv2.getTextSize and cv2.putText would give the whole string). Like them,
+# the advances are added unrounded and only the position of every character is rounded, so with
+# a fractional font scale the characters do not drift away from where cv2.putText draws them.
+def glyph_positions(time_str, atlas, center_x, thickness):
+    text_width = round(sum(atlas[char][3] for char in time_str) + thickness)
+    x = center_x - text_width // 2
+    positions = []
+    for char in time_str:
+        positions.append(round(x))
+        x += atlas[char][3]
+    return positions
+
+
+# Function to draw a time string by copying the cached glyph masks onto the image.
+# origin is the position of the image inside the full frame, so the text can be drawn
+# into a region of the frame; glyphs are clipped to the image.
+def draw_glyph_text(image, time_str, positions, text_y, atlas, color, origin=(0, 0)):
+    height, width = image.shape[:2]
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        top, left = text_y + offset_y - origin[1], x + offset_x - origin[0]
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + mask.shape[0], height), min(left + mask.shape[1], width)
+        if y0 < y1 and x0 < x1:
+            image[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - left:x1 - left]] = color
+
+
+# Function to get the bounding rectangle (x0, y0, x1, y1) of a time string drawn from the atlas
+def glyph_text_rect(time_str, positions, text_y, atlas):
+    x0 = y0 = float("inf")
+    x1 = y1 = float("-inf")
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        x0, y0 = min(x0, x + offset_x), min(y0, text_y + offset_y)
+        x1, y1 = max(x1, x + offset_x + mask.shape[1]), max(y1, text_y + offset_y + mask.shape[0])
+    return (x0, y0, x1, y1)
+
+
+# Function to get the bounding rectangle of the part of a ring between two angles
+# (in degrees from start_angle), padded to include the ring thickness and the end circle
+def arc_rect(center, radius, start_angle, angle_from, angle_to, pad):
+    first, last = start_angle + angle_from, start_angle + angle_to
+    # The arc reaches its extremes at its ends and wherever it crosses an axis
+    angles = np.radians([first, last] + [90 * k for k in range(-(-first // 90), last // 90 + 1)])
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
+    return (int(xs.min()) - pad, int(ys.min()) - pad, int(xs.max()) + pad + 1, int(ys.max()) + pad + 1)
+
+
+# Function to check if two rectangles overlap
+def rects_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# Function to clip rectangles to the frame and merge the ones that overlap,
+# so no area of the frame is restored and redrawn twice
+def merge_rects(rects, width, height):
+    merged = []
+    for rect in rects:
+        rect = (max(rect[0], 0), max(rect[1], 0), min(rect[2], width), min(rect[3], height))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            continue
+        i = 0
+        while i < len(merged):
+            if rects_overlap(merged[i], rect):
+                other = merged.pop(i)
+                rect = (min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3]))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+# Video writer that pipes raw frames to an ffmpeg process, with the same write() and release()
+# methods as cv2.VideoWriter. Frames are sent as BGR (bgr24) or converted to planar YUV 4:2:0
+# (yuv420p) first, which halves the bytes going through the pipe and saves ffmpeg the conversion.
+# fps is the rate of the written frames and display_fps the frame rate players should see.
+# keyframe_seconds are seconds from the start of the file that must start with a keyframe.
+# The YUV frames are converted into a buffer allocated once per writer.
+class FFmpegWriter:
+    def __init__(self, output_file, fps, size, display_fps, keyframe_seconds=()):
+        width, height = size
+        self.pixel_format = pipe_pixel_format
+        if self.pixel_format == "yuv420p":
+            self.yuv_frame = np.empty((height * 3 // 2, width), dtype=np.uint8)
+        output_fps = display_fps if frame_rate_mode == "content_cfr" else fps
+        command = [
+            ffmpeg_binary, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", self.pixel_format, "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-c:v", ffmpeg_codec, "-preset", ffmpeg_preset, "-tune", ffmpeg_tune,
+            "-g", str(gop_seconds * output_fps), "-threads", str(opencv_threads_per_worker),
+            "-pix_fmt", "yuv420p",
+        ]
+        if output_fps != fps:
+            # ffmpeg repeats every frame up to the display frame rate before the encoder
+            command += ["-r", str(output_fps)]
+        if keyframe_seconds:
+            # IDR keyframes, so the video can be cut there without re-encoding
+            command += ["-force_key_frames", ",".join(str(second) for second in keyframe_seconds), "-forced-idr", "1"]
+        command.append(output_file)
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        if self.pixel_format == "yuv420p":
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420, dst=self.yuv_frame)
+        self.process.stdin.write(frame.data)
+
+    def release(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise subprocess.CalledProcessError(self.process.returncode, self.process.args)
+
+    # Stops ffmpeg without letting it finish the file, for a render that failed
+    def abort(self):
+        self.process.kill()
+        self.process.wait()
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+# Function to open a video writer with the selected backend.
+# The cv2.VideoWriter (mp4v) backend is used when ffmpeg is not found, it always stores the
+# frames at the rate they are written.
+def open_video_writer(output_file, fps, size, display_fps, keyframe_seconds=()):
+    if writer_backend == "ffmpeg" and ffmpeg_binary:
+        return FFmpegWriter(output_file, fps, size, display_fps, keyframe_seconds)
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    return cv2.VideoWriter(output_file, fourcc, fps, size)
+
+
+# Function to stop a video writer whose render failed: ffmpeg is killed instead of finishing
+# a partial file, a cv2.VideoWriter is only released
+def abort_video_writer(out):
+    if isinstance(out, FFmpegWriter):
+        out.abort()
+    else:
+        out.release()
+
+
+# Function to get the output file path of a video (the hour series is named by hours, like 013-skip.py).
+# Videos in the default size keep the names of the previous scripts, the other sizes add their name.
+def video_path(font_index, duration, variant):
+    theme, size = variant
+    name = theme if size == default_size else f"{theme}_{size}"
+    if series == "hours" and duration % 3600 == 0:
+        return f"render/countdown_timer_{duration // 3600}h_font_{font_index}_{name}.mp4"
+    return f"render/countdown_timer_{duration}s_font_{font_index}_{name}.mp4"
+
+
+# Function to get the number of time segments a video is split into
+def segment_count(duration):
+    if segment_seconds is None:
+        return 1
+    return -(-duration // segment_seconds)
+
+
+# Function to get the file path of one time segment of a video
+def segment_path(font_index, duration, variant, segment_index):
+    name = os.path.splitext(os.path.basename(video_path(font_index, duration, variant)))[0]
+    return f"render/segments/{name}_{segment_index:04}.mp4"
+
+
+# Function to get the path a file is written to before it is complete.
+# It is renamed to its final path when it is finished, so an interrupted render never leaves
+# a truncated file with the final name.
+def part_path(path):
+    root, extension = os.path.splitext(path)
+    return root + ".part" + extension
+
+
+# Function to join the segments of a video into its output file without re-encoding.
+# Every segment is a separate video file, so it starts on a keyframe and the ffmpeg concat
+# demuxer can copy the streams one after the other. A single segment is just renamed.
+def join_segments(segment_files, output_file):
+    if len(segment_files) == 1:
+        os.replace(segment_files[0], output_file)
+        return
+
+    list_file = output_file + ".txt"
+    with open(list_file, "w") as f:
+        for segment_file in segment_files:
+            f.write(f"file '{os.path.abspath(segment_file)}'\n")
+
+    subprocess.run(
+        [ffmpeg_binary, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_file, "-c", "copy", part_path(output_file)],
+        check=True,
+    )
+    os.replace(part_path(output_file), output_file)
+
+    os.remove(list_file)
+    for segment_file in segment_files:
+        os.remove(segment_file)
+
+
+# Function to cut the last seconds of a master video into another video without re-encoding.
+# The master must have a keyframe at start_second.
+def cut_video(master_file, output_file, start_second, seconds):
+    subprocess.run(
+        [ffmpeg_binary, "-y", "-loglevel", "error", "-ss", str(start_second), "-i", master_file, "-t", str(seconds), "-c", "copy", "-avoid_negative_ts", "make_zero", part_path(output_file)],
+        check=True,
+    )
+    os.replace(part_path(output_file), output_file)
+
+
+# Function to get every parameter that changes the pixels or the encoding of a video
+def video_spec(font_index, duration, variant):
+    theme, size = variant
+    return {
+        "duration": duration,
+        "series": series,
+        "size": list(sizes[size]),
+        "fps": fps,
+        "frame_rate_mode": frame_rate_mode,
+        "font": fonts[font_index],
+        "font_scale": font_scale,
+        "thickness": thickness,
+        "ring_thickness": ring_thickness,
+        "opacity": opacity,
+        "thin_ring_thickness": thin_ring_thickness,
+        "start_angle": start_angle,
+        "theme": themes[theme],
+        "writer": [writer_backend, pipe_pixel_format, ffmpeg_codec, ffmpeg_preset, ffmpeg_tune, gop_seconds] if writer_backend == "ffmpeg" and ffmpeg_binary else ["cv2", "mp4v"],
+    }
+
+
+# Function to get the hash of the spec of a video, which identifies its content
+def spec_hash(font_index, duration, variant):
+    spec = json.dumps(video_spec(font_index, duration, variant), sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+# Function to load a JSON file of the render (the checkpoint or the manifest), or an empty one.
+# The checkpoint has:
+#   "segments"  - for every unfinished video, the finished segments and the spec hash, segment
+#                 length and keyframe seconds they were rendered with
+#   "keyframes" - for every finished video, the seconds where it has keyframes to cut from
+# The manifest has the spec hash, size and frame count of every finished video.
+def load_json(path, empty):
+    if not os.path.exists(path):
+        return empty
+    with open(path) as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as error:
+            print(f"File {path} is damaged ({error}). Starting with an empty one.")
+            return empty
+
+
+# Function to save a JSON file of the render, replacing the previous one in a single step
+# so a crash while writing it keeps the old one. The new one is flushed to disk first
+# so a power cut right after the replace cannot leave an empty file in its place.
+def save_json(path, data):
+    with open(part_path(path), "w") as f:
+        json.dump(data, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(part_path(path), path)
+
+
+# Function to record a finished video in the manifest with its spec hash, size and frame count
+def record_video(manifest, font_index, duration, variant):
+    output_file = video_path(font_index, duration, variant)
+    capture = cv2.VideoCapture(output_file)
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    manifest[output_file] = {
+        "spec_hash": spec_hash(font_index, duration, variant),
+        "size": os.path.getsize(output_file),
+        "frames": frame_count,
+    }
+    save_json(manifest_file, manifest)
+    print(f"Video creation complete and saved in the 'render' folder! Font {font_index}, Duration: {duration} seconds, Variant: {variant[0]}, Size: {variant[1]}")
+
+
+# Function to join a video whose segments are all rendered, record it in the checkpoint and the
+# manifest and cut the shorter countdowns of trimmed_durations from the end of it
+def finish_video(font_index, duration, variant, trimmed_durations, checkpoint, manifest):
+    output_file = video_path(font_index, duration, variant)
+    segment_files = [segment_path(font_index, duration, variant, segment_index) for segment_index in range(segment_count(duration))]
+    join_segments(segment_files, output_file)
+
+    entry = checkpoint["segments"].pop(output_file)
+    checkpoint["keyframes"][output_file] = entry["cut_seconds"]
+    save_json(checkpoint_file, checkpoint)
+    record_video(manifest, font_index, duration, variant)
+
+    for trimmed_duration in trimmed_durations:
+        cut_video(output_file, video_path(font_index, trimmed_duration, variant), duration - trimmed_duration, trimmed_duration)
+        record_video(manifest, font_index, trimmed_duration, variant)
+
+
+# Function to get the durations of a series of countdowns
+def series_durations(name):
+    if name == "hours":
+        return [3600 * hora for hora in range(1, 11)]
+    # Time intervals for the countdowns
+    return [
+        10, 20, 30,  # 10, 20, 30 seconds
+        *[60 * i for i in range(1, 11)],  # 1-10 minutes
+        *[60 * i for i in range(10, 61, 5)]  # 10-60 minutes (every 5 minutes)
+    ]
+
+
+# Function to apply the settings, themes and sizes of a render spec to the module globals.
+# It runs in the main process and again in every worker process, which may not share them.
+def apply_spec(spec):
+    global workers, segment_seconds
+    settings = spec.get("settings", {})
+    for name, value in settings.items():
+        if name not in spec_settings:
+            raise ValueError(f"Unknown setting in the render spec: {name}")
+        globals()[name] = value
+
+    # The default number of workers depends on the OpenCV threads of each one, which the spec can change
+    if "workers" not in settings:
+        workers = max(1, (os.cpu_count() or 1) // opencv_threads_per_worker)
+
+    # Segments are joined with ffmpeg, so without it every video is rendered in one piece
+    if ffmpeg_binary is None:
+        segment_seconds = None
+    themes.update(spec.get("themes", {}))
+    for name, (size_width, size_height) in spec.get("sizes", {}).items():
+        if size_width % 2 or size_height % 2:
+            # The frames are encoded as yuv420p, which halves the width and height of the colors
+            raise ValueError(f"Size {name} of the render spec is not even: {size_width}x{size_height}")
+    sizes.update({name: tuple(size) for name, size in spec.get("sizes", {}).items()})
+
+
+# Function to expand the jobs of a render spec into the list of videos they ask for.
+# A job is a grid of fonts x durations x sizes x variants:
+#   "fonts"     - list of font indexes, or "all" (default)
+#   "durations" - list of durations in seconds, or the name of a series (default: the series setting)
+#   "sizes"     - list of size names (default: the output_sizes setting)
+#   "variants"  - list of theme names (default: all the variants)
+# Every video is rendered in a (theme, size) variant.
+# Jobs can overlap, every video is only kept once, in the order it is first asked for.
+def expand_jobs(jobs):
+    videos = {}
+    requested = 0
+    for job in jobs:
+        job_fonts = job.get("fonts", "all")
+        job_durations = job.get("durations", series)
+        job_sizes = job.get("sizes", output_sizes)
+        job_variants = job.get("variants", variants)
+        if job_fonts == "all":
+            job_fonts = range(len(fonts))
+        if isinstance(job_durations, str):
+            job_durations = series_durations(job_durations)
+        for variant in job_variants:
+            if variant not in themes:
+                raise ValueError(f"Unknown theme in the render spec: {variant}")
+        for size in job_sizes:
+            if size not in sizes:
+                raise ValueError(f"Unknown size in the render spec: {size}")
+
+        for font_index in job_fonts:
+            for duration in job_durations:
+                for size in job_sizes:
+                    for theme in job_variants:
+                        videos.setdefault((font_index, duration, (theme, size)), None)
+                        requested += 1
+    return list(videos), requested
+
+
+# Function to check if a video has to be rendered: it returns why, or None when its file exists,
+# is in the manifest with the same spec hash (it was made by this script with the same parameters)
+# and was not changed since it was recorded
+def render_reason(manifest, font_index, duration, variant):
+    output_file = video_path(font_index, duration, variant)
+    if not os.path.exists(output_file):
+        return "does not exist"
+    entry = manifest.get(output_file)
+    if entry is None:
+        return "is not in the manifest"
+    if entry["spec_hash"] != spec_hash(font_index, duration, variant):
+        return "was rendered with other parameters"
+    if entry["size"] != os.path.getsize(output_file):
+        return "changed since it was rendered"
+    return None
+
+
+# Function to export the metrics of a finished job segment: a JSON line appended to the metrics
+# file, or the totals of the run in a Prometheus textfile (replaced in a single step, so the
+# collector never reads half of it). totals keeps the counters of the run between calls, and the
+# deepest writer queue of every video, exported as a gauge.
+def export_metrics(job_metrics, totals):
+    os.makedirs(os.path.dirname(metrics_file), exist_ok=True)
+    if metrics_format == "jsonl":
+        record = dict(job_metrics, time=datetime.now().isoformat(timespec="seconds"))
+        with open(metrics_file + ".jsonl", "a") as f:
+            f.write(json.dumps(record) + "\n")
+        return
+
+    duration_labels = (("duration", job_metrics["duration"]),)
+    counters = [
+        ("countdown_segments_total", duration_labels, 1),
+        ("countdown_segment_seconds_total", duration_labels, job_metrics["seconds"]),
+        ("countdown_rings_seconds_total", duration_labels, job_metrics["rings_seconds"]),
+    ]
+    gauges = []
+    for font in job_metrics["fonts"]:
+        counters.append(("countdown_text_seconds_total", (("font", font["font"]),), font["text_seconds"]))
+        for video in font["videos"]:
+            labels = (("font", font["font"]), ("variant", video["variant"]), ("size", video["size"]))
+            for key, name in [("colorize_seconds", "colorize_seconds"), ("write_seconds", "write_seconds"), ("frames", "frames_written"),
+                              ("bytes", "encoded_bytes"), ("stalls", "write_stalls"), ("stall_seconds", "write_stall_seconds"),
+                              ("queue_full_seconds", "queue_full_seconds")]:
+                counters.append((f"countdown_{name}_total", labels, video[key]))
+            gauges.append(("countdown_queue_depth_max", labels, video["queue_depth_max"]))
+    for name, labels, value in counters:
+        totals[(name, labels)] = totals.get((name, labels), 0) + value
+    for name, labels, value in gauges:
+        totals[(name, labels)] = max(totals.get((name, labels), 0), value)
+
+    lines = []
+    for name in sorted({name for name, _ in totals}):
+        lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+        for (other, labels), value in totals.items():
+            if other == name:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+    with open(part_path(metrics_file + ".prom"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(part_path(metrics_file + ".prom"), metrics_file + ".prom")
+
+
+# Function to write a frame to a video, adding the time it took to the metrics of the video
+def write_frame(out, frame, metrics):
+    if metrics_format is None:
+        out.write(frame)
+        metrics["frames"] += 1
+        return
+    started = time.perf_counter()
+    out.write(frame)
+    elapsed = time.perf_counter() - started
+    metrics["write_seconds"] += elapsed
+    metrics["frames"] += 1
+    if elapsed > stall_seconds:
+        metrics["stalls"] += 1
+        metrics["stall_seconds"] += elapsed
+
+
+# Pool of preallocated frame buffers shared by the drawing thread and a writer thread.
+# take() waits for a free buffer, the frame is copied into it with np.copyto and the writer
+# thread gives it back once it has been written, so the same few buffers are used for the
+# whole video.
+class FramePool:
+    def __init__(self, count, shape):
+        self.free = queue.Queue()
+        for _ in range(count):
+            self.free.put(np.empty(shape, dtype=np.uint8))
+
+    def take(self):
+        return self.free.get()
+
+    def give_back(self, buffer):
+        self.free.put(buffer)
+
+
+# Function run by a writer thread of the pipeline mode: it writes the frames of its queue to a
+# video until it gets None. After an error the frames are still taken from the queue (without
+# writing them), so the drawing thread never waits forever on a full queue; the error is kept
+# in errors and raised again by the drawing thread.
+# In hold mode the same buffer is queued for every frame of a second, so a buffer is given back
+# to the pool when the next one arrives (the queue keeps the order of the frames).
+def write_frames(out, frame_queue, metrics, errors, pool):
+    current = None
+    while True:
+        frame = frame_queue.get()
+        if frame is not current:
+            if current is not None:
+                pool.give_back(current)
+            current = frame
+        if frame is None:
+            return
+        if errors:
+            continue
+        try:
+            write_frame(out, frame, metrics)
+        except Exception as error:
+            errors.append(error)
+
+
+# Function to stop the writer threads of the pipeline mode once all their frames are queued, or
+# after an error. Every thread still running gets None and they are waited for.
+def stop_writer_threads(frame_queues, writer_threads):
+    for frame_queue, thread in zip(frame_queues, writer_threads):
+        if thread.is_alive():
+            frame_queue.put(None)
+    for thread in writer_threads:
+        thread.join()
+
+
+# Function to get the first and last second (not included) of one time segment of a video
+def segment_bounds(duration, segment_index):
+    if segment_seconds is None:
+        return 0, duration
+    first_second = segment_index * segment_seconds
+    return first_second, min(first_second + segment_seconds, duration)
+
+
+# Exponentially weighted moving average of the rate work is done at, in frames per second.
+# Every update measures the rate since the previous one and moves the average towards it by
+# the smoothing factor, so the estimate follows changes of speed without jumping on every sample.
+class RateEstimator:
+    def __init__(self, smoothing):
+        self.smoothing = smoothing
+        self.rate = None
+        self.last_time = None
+        self.last_done = 0
+
+    def update(self, done, now):
+        if self.last_time is not None and now > self.last_time:
+            rate = (done - self.last_done) / (now - self.last_time)
+            self.rate = rate if self.rate is None else self.smoothing * rate + (1 - self.smoothing) * self.rate
+        self.last_time, self.last_done = now, done
+
+    # Seconds left to do the remaining frames at the current rate (None until there is a rate)
+    def eta(self, remaining):
+        if not self.rate:
+            return None
+        return remaining / self.rate
+
+
+# Function to format a number of seconds as H:MM:SS, or "?" when it is not known yet
+def format_eta(seconds):
+    if seconds is None:
+        return "?"
+    return str(timedelta(seconds=int(seconds)))
+
+
+# Function to print the progress of the batch and of every running job segment, as one text line
+# or one JSON line. progress holds [done frames, total frames, RateEstimator] for every task.
+def print_progress(progress, batch_rate):
+    done = sum(task[0] for task in progress.values())
+    total = sum(task[1] for task in progress.values())
+    batch_eta = batch_rate.eta(total - done)
+    running = [
+        (key, task) for key, task in progress.items() if 0 < task[0] < task[1]
+    ]
+
+    if progress_format == "json":
+        print(json.dumps({
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "done_frames": done,
+            "total_frames": total,
+            "frames_per_second": batch_rate.rate,
+            "eta_seconds": batch_eta,
+            "running": [
+                {"duration": key[0], "fonts": [font_index for font_index, _ in key[1]], "segment": key[2],
+                 "done_frames": task[0], "total_frames": task[1], "frames_per_second": task[2].rate, "eta_seconds": task[2].eta(task[1] - task[0])}
+                for key, task in running
+            ],
+        }))
+        return
+
+    finish = "?" if batch_eta is None else (datetime.now() + timedelta(seconds=batch_eta)).strftime("%Y-%m-%d %H:%M:%S")
+    jobs_text = ", ".join(
+        f"{key[0]}s #{key[2]} {task[0] / task[1]:.0%} ETA {format_eta(task[2].eta(task[1] - task[0]))}"
+        for key, task in running
+    ) or "-"
+    rate_text = "?" if batch_rate.rate is None else f"{batch_rate.rate:.1f}"
+    print(f"Progress {done / max(total, 1):.1%} ({done}/{total} frames) at {rate_text} frames/s, ETA {format_eta(batch_eta)} (finish {finish}) | Running: {jobs_text}")
+
+
+# Function run by each worker process when it starts: the render spec is applied, the queue
+# where progress is reported is kept and, as every process draws and encodes a whole segment,
+# OpenCV is limited to a few threads to not oversubscribe the cores
+def init_worker(spec, queue):
+    global progress_queue
+    apply_spec(spec)
+    progress_queue = queue
+    cv2.setNumThreads(opencv_threads_per_worker)
+
+
+# Function to render one time segment of the videos of a duration in several fonts and variants,
+# run in a worker process. font_variants holds (font index, variants) pairs, and a variant is a
+# (theme, size) pair.
+# Every size has its own layout: the dial, the rings and the text are laid out for its geometry
+# and drawn into its own layer images. The time and the ring angles are computed once per second
+# for all the sizes.
+# The rings and the dial do not depend on the font, so every second they are drawn once per size
+# into a shared layer image; the layer image of each font is that one plus its text, and each
+# variant is colored from it with the palette of its theme.
+# cut_seconds are the seconds of the whole video where shorter videos will be cut from it.
+def render_segment(duration, font_variants, segment_index, cut_seconds=()):
+    # Every (font, variant) video rendered by this job
+    videos = [(font_index, variant) for font_index, job_variants in font_variants for variant in job_variants]
+    output_files = [segment_path(font_index, duration, variant, segment_index) for font_index, variant in videos]
+
+    # Rate of the frames written to the video: one per second (the rate the content changes)
+    # or the display frame rate
+    video_fps = fps if frame_rate_mode == "display" else 1
+
+    # Colors of every layer combination for the theme of each variant
+    palettes = {theme: theme_palette(themes[theme], opacity) for _, (theme, _) in videos}
+
+    # Frame of every video, kept between seconds so only the changed rectangles are redrawn
+    frames = {video: np.empty(sizes[video[1][1]][::-1] + (3,), dtype=np.uint8) for video in videos}
+
+    # Instrumentation of the job: seconds spent drawing the rings, drawing the text of every font
+    # and coloring, writing and encoding every video, and the writes that stalled (took longer than
+    # stall_seconds because the encoder did not keep up)
+    font_metrics = [
+        {
+            "font": font_index,
+            "text_seconds": 0.0,
+            "videos": [
+                {"variant": theme, "size": size, "colorize_seconds": 0.0, "write_seconds": 0.0, "frames": 0, "bytes": 0, "stalls": 0,
+                 "stall_seconds": 0.0, "queue_full_seconds": 0.0, "queue_depth_max": 0}
+                for theme, size in job_variants
+            ],
+        }
+        for font_index, job_variants in font_variants
+    ]
+    rings_seconds = 0.0
+
+    # The timings are only taken when they are exported, so a render without metrics does not
+    # read the clock in the frame loop
+    timed = metrics_format is not None
+
+    # Layout of every size of the job, with the images it is drawn into:
+    #   "background"  - layer image with the static dial already drawn on it. Each pixel of a
+    #                   layer image holds the layers that cover it as bits.
+    #   "ring_mask"   - scratch mask where the rings are rasterized before being added to the layer image
+    #   "color_scratch" - scratch buffer where the rectangles of the frames are colored before being copied in
+    #   "ring_layers" - layer image of the rings, shared by the fonts
+    #   "texts"       - text of every font, as [font index, glyph atlas, text baseline, positions
+    #                   per format or None, previous text rectangle]. The digits and the colon are
+    #                   rasterized once per font. When all digits of a font have the same advance
+    #                   every MM:SS (or HH:MM:SS) string has the same width, so its glyph positions
+    #                   are computed once per format and reused.
+    #   "font_layers", "frames", "font_metrics" - layer image, frames of the variants in this size
+    #                   and (font metrics, metrics of those variants) of every font
+    layouts = []
+    for size in dict.fromkeys(size for _, (_, size) in videos):
+        layout = size_layout(sizes[size])
+        width, height = layout["size"]
+        center = layout["center"]
+
+        background = np.zeros((height, width), dtype=np.uint8)
+        draw_tick_dial(background, center, layout["outer_radius"], layout["ring_thickness"], start_angle, tick_layer,
+                       layout["thin_ring_thickness"], layout["mark_length"])
+        layout["background"] = background
+        layout["ring_mask"] = np.zeros((height, width), dtype=np.uint8)
+        layout["color_scratch"] = np.empty(height * width * 3, dtype=np.uint8)
+        layout["ring_layers"] = background.copy()
+
+        # Padding around a ring arc: half the ring thickness or the end circle radius
+        layout["ring_pad"] = max(layout["ring_thickness"] // 2, layout["dot_radius"]) + 2
+
+        layout["texts"], layout["font_layers"], layout["frames"], layout["font_metrics"] = [], [], [], []
+        for (font_index, job_variants), metrics in zip(font_variants, font_metrics):
+            size_variants = [(variant, variant_metrics) for variant, variant_metrics in zip(job_variants, metrics["videos"]) if variant[1] == size]
+            if not size_variants:
+                continue
+            atlas = build_glyph_atlas(fonts[font_index], layout["font_scale"], layout["thickness"])
+            text_height = cv2.getTextSize("0", fonts[font_index], layout["font_scale"], layout["thickness"])[0][1]  # Same for any string
+            fixed_width = len({atlas[digit][3] for digit in "0123456789"}) == 1
+            layout["texts"].append([font_index, atlas, center[1] + text_height // 2, {} if fixed_width else None, None])
+            layout["font_layers"].append(background.copy())
+            layout["frames"].append([frames[(font_index, variant)] for variant, _ in size_variants])
+            layout["font_metrics"].append((metrics, [variant_metrics for _, variant_metrics in size_variants]))
+        layout["previous_rings"] = None
+        layouts.append(layout)
+    previous_time_str = None
+
+    # Frames of this segment (the whole video when it is not split)
+    first_second, last_second = segment_bounds(duration, segment_index)
+    first_frame, last_frame = first_second * video_fps, last_second * video_fps
+
+    # Create a video writer for every video with the selected backend, with keyframes where the shorter videos start
+    keyframe_seconds = [second - first_second for second in cut_seconds if first_second <= second < last_second]
+    writers = [
+        open_video_writer(part_path(output_file), video_fps, sizes[variant[1]], fps, keyframe_seconds)
+        for output_file, (_, variant) in zip(output_files, videos)
+    ]
+
+    # Frames and metrics of every video in the same order as the writers
+    video_frames = [frames[video] for video in videos]
+    video_metrics = [metrics for font in font_metrics for metrics in font["videos"]]
+
+    # In pipeline mode every video has a writer thread taking frames from a bounded queue, so the
+    # next frames are drawn while the previous ones are converted and encoded (OpenCV, NumPy and
+    # the writes to the encoder release the GIL). Frames are queued as copies in buffers of a pool,
+    # because the frames of the videos are redrawn in place; in hold mode the copy of a second is
+    # queued again for every frame of that second. The queue holds at most pipeline_queue_size
+    # buffers and the writer thread one more, so with two more buffers in the pool the drawing
+    # thread only waits for a free buffer when the queue is full anyway.
+    if pipeline_mode:
+        frame_queues = [queue.Queue(maxsize=pipeline_queue_size) for _ in writers]
+        frame_pools = [FramePool(pipeline_queue_size + 2, frame.shape) for frame in video_frames]
+        writer_errors = []
+        writer_threads = [
+            threading.Thread(target=write_frames, args=(out, frame_queue, metrics, writer_errors, pool), daemon=True)
+            for out, frame_queue, metrics, pool in zip(writers, frame_queues, video_metrics, frame_pools)
+        ]
+        for thread in writer_threads:
+            thread.start()
+        queued_frames = None
+
+    # Start time, and time of the next progress report to the main process
+    job_start = time.perf_counter()
+    next_report = job_start
+    progress_key = (duration, font_variants, segment_index)
+
+    # Second shown by the last drawn frame (None forces the first frame to be drawn)
+    rendered_seconds = None
+
+    # A job that fails always stops its writer threads, so none is left waiting on its queue,
+    # and kills its encoders instead of leaving them writing a partial file
+    completed = False
+    try:
+        for frame_count in range(first_frame, last_frame):
+            # Calculate the remaining time in seconds
+            remaining_seconds = duration - (frame_count // video_fps)
+
+            # In hold mode a frame is only drawn when the displayed second changes,
+            # then the same frame is written to the video for the rest of that second
+            if render_mode == "per_frame" or remaining_seconds != rendered_seconds:
+                rendered_seconds = remaining_seconds
+                queued_frames = None
+
+                # Calculate the time in MM:SS format (handling hours if needed)
+                hours = remaining_seconds // 3600
+                minutes = (remaining_seconds % 3600) // 60
+                seconds = remaining_seconds % 60
+                if hours > 0:
+                    time_str = two_digits[hours] + ":" + two_digits[minutes] + ":" + two_digits[seconds]
+                else:
+                    time_str = two_digits[minutes] + ":" + two_digits[seconds]
+
+                # Calculate angles for the rings (full circle is 360 degrees)
+                if duration >= 3600 and hours > 0:
+                    hour_angle = int(360 * (hours / (duration // 3600 if duration // 3600 <= 24 else 24)))
+                else:
+                    hour_angle = 0  # No hour ring for durations under 1 hour or if hours is 0
+
+                minute_angle = int(360 * (minutes / 60)) if minutes > 0 else 0
+                second_angle = int(360 * (seconds / 60)) if seconds > 0 else 0
+
+                text_changed = time_str != previous_time_str
+                previous_time_str = time_str
+
+                for layout in layouts:
+                    width, height = layout["size"]
+                    center, outer_radius, layout_ring_thickness = layout["center"], layout["outer_radius"], layout["ring_thickness"]
+                    background, ring_layers, ring_pad = layout["background"], layout["ring_layers"], layout["ring_pad"]
+
+                    # Rings as (radius, layer, angle), a ring with angle 0 is not drawn
+                    rings = [
+                        (outer_radius, hour_layer, hour_angle),  # Hour ring
+                        (outer_radius - layout_ring_thickness * 2, minute_layer, minute_angle),  # Minute ring
+                        (outer_radius - layout_ring_thickness * 4, second_layer, second_angle),  # Second ring
+                    ]
+
+                    # Find the rectangles of the rings that changed since the previously drawn frame:
+                    # the part of every ring between its old and new angle.
+                    # OpenCV draws arcs as polylines with a point every 5 degrees, so the segment
+                    # before the smaller angle can change too and is included.
+                    full_redraw = render_mode == "per_frame" or layout["previous_rings"] is None
+                    if full_redraw:
+                        ring_rects = [(0, 0, width, height)]
+                    else:
+                        ring_rects = []
+                        for (radius, _, angle), (_, _, previous_angle) in zip(rings, layout["previous_rings"]):
+                            if angle != previous_angle:
+                                ring_rects.append(arc_rect(center, radius, start_angle, min(angle, previous_angle) - 5, max(angle, previous_angle), ring_pad))
+                    layout["previous_rings"] = rings
+
+                    # Restore every changed ring rectangle from the background (the dial is already on it)
+                    # and redraw only the rings that overlap it, once for all the fonts
+                    if timed:
+                        started = time.perf_counter()
+                    for rect in merge_rects(ring_rects, width, height):
+                        x0, y0, x1, y1 = rect
+                        ring_layers[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+
+                        for radius, layer, angle in rings:
+                            if angle > 0 and rects_overlap(arc_rect(center, radius, start_angle, 0, angle, ring_pad), rect):
+                                draw_ring_layer(ring_layers, layout["ring_mask"], rect, center, radius, start_angle, angle, layer,
+                                                layout_ring_thickness, layout["dot_radius"])
+                    if timed:
+                        rings_seconds += time.perf_counter() - started
+
+                    for text, layers, font_frames, (metrics, size_metrics) in zip(layout["texts"], layout["font_layers"], layout["frames"], layout["font_metrics"]):
+                        font_index, atlas, text_y, format_positions, previous_text_rect = text
+
+                        # Center the countdown timer on the entire image
+                        positions = None if format_positions is None else format_positions.get(len(time_str))
+                        if positions is None:
+                            positions = glyph_positions(time_str, atlas, center[0], layout["thickness"])
+                            if format_positions is not None:
+                                format_positions[len(time_str)] = positions
+                        text_rect = glyph_text_rect(time_str, positions, text_y, atlas)
+                        text[4] = text_rect
+
+                        # The changed rectangles of this font are the ring ones and its old and new text
+                        dirty_rects = list(ring_rects)
+                        if text_changed and not full_redraw:
+                            dirty_rects.append(previous_text_rect)
+                            dirty_rects.append(text_rect)
+
+                        # Copy every dirty rectangle from the ring layers and draw the text over it
+                        for rect in merge_rects(dirty_rects, width, height):
+                            if timed:
+                                started = time.perf_counter()
+                            x0, y0, x1, y1 = rect
+                            roi = layers[y0:y1, x0:x1]
+                            roi[:] = ring_layers[y0:y1, x0:x1]
+
+                            # Draw the countdown timer from the glyph atlas (the text is opaque and on top of everything)
+                            if rects_overlap(text_rect, rect):
+                                draw_glyph_text(roi, time_str, positions, text_y, atlas, text_layer, (x0, y0))
+                            if timed:
+                                metrics["text_seconds"] += time.perf_counter() - started
+
+                            # Color the rectangle of every variant by looking its layers up in the theme palette
+                            # (with mode="clip", as every layer combination is inside the palette). The rectangle of a
+                            # frame is not contiguous, so np.take would color it into a temporary array of its own;
+                            # it is colored into the contiguous start of the scratch buffer and copied into the frame.
+                            colored = layout["color_scratch"][:(y1 - y0) * (x1 - x0) * 3].reshape(y1 - y0, x1 - x0, 3)
+                            for frame, variant_metrics in zip(font_frames, size_metrics):
+                                if timed:
+                                    started = time.perf_counter()
+                                np.take(palettes[variant_metrics["variant"]], roi, axis=0, out=colored, mode="clip")
+                                frame[y0:y1, x0:x1] = colored
+                                if timed:
+                                    variant_metrics["colorize_seconds"] += time.perf_counter() - started
+
+            # Report the frames written so far to the main process, which prints the progress of
+            # the whole batch (at most every progress_report_seconds, not for every frame)
+            if progress_queue is not None and time.perf_counter() >= next_report:
+                progress_queue.put((progress_key, (frame_count - first_frame) * len(videos)))
+                next_report = time.perf_counter() + progress_report_seconds
+
+            # Write the frame of every video, or queue it for its writer thread. The depth of the
+            # queues and the time spent waiting for a free place or buffer (the encoder is the
+            # bottleneck) are kept in the metrics to tune the queue size.
+            if pipeline_mode:
+                # A writer thread failed: stop here instead of drawing the rest of the segment
+                if writer_errors:
+                    raise writer_errors[0]
+                if queued_frames is None:
+                    queued_frames = []
+                    for pool, frame, metrics in zip(frame_pools, video_frames, video_metrics):
+                        if timed:
+                            started = time.perf_counter()
+                        buffer = pool.take()
+                        if timed:
+                            metrics["queue_full_seconds"] += time.perf_counter() - started
+                        np.copyto(buffer, frame)
+                        queued_frames.append(buffer)
+                for frame_queue, frame, metrics in zip(frame_queues, queued_frames, video_metrics):
+                    metrics["queue_depth_max"] = max(metrics["queue_depth_max"], frame_queue.qsize())
+                    if timed:
+                        started = time.perf_counter()
+                    frame_queue.put(frame)
+                    if timed:
+                        metrics["queue_full_seconds"] += time.perf_counter() - started
+            else:
+                for out, frame, metrics in zip(writers, video_frames, video_metrics):
+                    write_frame(out, frame, metrics)
+
+        # Wait for the writer threads to write all the queued frames
+        if pipeline_mode:
+            stop_writer_threads(frame_queues, writer_threads)
+            if writer_errors:
+                raise writer_errors[0]
+
+        # Release the video writers (waiting for the encoders to finish) and give the finished
+        # segments their final names
+        for out, output_file, metrics in zip(writers, output_files, video_metrics):
+            if timed:
+                started = time.perf_counter()
+            out.release()
+            if timed:
+                metrics["write_seconds"] += time.perf_counter() - started
+            os.replace(part_path(output_file), output_file)
+            metrics["bytes"] = os.path.getsize(output_file)
+        completed = True
+    finally:
+        if not completed:
+            if pipeline_mode:
+                stop_writer_threads(frame_queues, writer_threads)
+            for out in writers:
+                abort_video_writer(out)
+
+    job_metrics = {
+        "duration": duration,
+        "segment": segment_index,
+        "seconds": time.perf_counter() - job_start,
+        "rings_seconds": rings_seconds,
+        "fonts": font_metrics,
+    }
+    return duration, font_variants, segment_index, job_metrics
+
+
+# Function to render a segment task tuple, used with the process pool
+def render_task(task):
+    return render_segment(*task)
+
+
+# List of available fonts in OpenCV
+fonts = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX_SMALL,
+    cv2.FONT_HERSHEY_SCRIPT_SIMPLEX,
+    cv2.FONT_HERSHEY_SCRIPT_COMPLEX,
+]
+
+# Series of countdowns to render:
+#   "intervals" - the time intervals from 10 seconds to 60 minutes of 018-circulitos.py
+#   "hours"     - the 1 to 10 hour countdowns of 00-fuente grande.py, 008-variaciones.py and 013-skip.py
+# It also sets the file names (the hour series is named by hours).
+series = "intervals"
+
+# Video properties. Every countdown can be rendered in several sizes in the same pass, each one
+# with the dial, rings and text laid out for its geometry. The spec can add sizes with its
+# "sizes" object (name -> [width, height]).
+sizes = {
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "720p": (1280, 720),
+    "vertical": (1080, 1920),  # Portrait screens and phone stories
+}
+default_size = "1080p"  # Size of the previous scripts, its videos keep their file names
+output_sizes = ["1080p"]  # Sizes rendered when a job does not list them
+fps = 60
+
+# Define a smaller font scale and thickness for the text
+font_scale = 4  # Smaller text for the countdown
+thickness = 16  # Slightly reduced thickness for countdown
+
+# Ring properties
+ring_thickness = 50
+opacity = 0.9  # Semi-transparent rings (90% opacity, 10% transparency)
+thin_ring_thickness = 2  # Thin rings for the divisions
+
+# Rotate the rings 90 degrees counterclockwise by adding 90 degrees to the start angle
+start_angle = -90
+
+# Two digit strings "00".."99", so the time string is not formatted for every frame
+two_digits = [f"{i:02}" for i in range(100)]
+
+# Render mode:
+#   "hold"      - draw one frame per displayed second and write it for the whole second (like 001-prueba.py);
+#                 only the rectangles that changed since the previous second are redrawn
+#   "per_frame" - redraw every single frame in full (previous behaviour, useful to compare outputs)
+render_mode = "hold"
+
+# Layers of the countdown, stored as bits in every pixel of the layer image
+tick_layer = 1  # Thin rings and division marks
+hour_layer = 2
+minute_layer = 4
+second_layer = 8
+dot_layer = 16  # Circle at the end of a ring
+text_layer = 32
+
+# Color themes. A new theme only needs its palette, the countdown is drawn once for all of them.
+themes = {
+    "light_bg": {
+        "background_color": (255, 255, 255),  # White background
+        "font_color": (0, 0, 0),  # Black font
+        "tick_color": (230, 230, 230),  # Grey
+        "hour_color": (0, 0, 255),  # Red
+        "minute_color": (0, 255, 0),  # Green
+        "second_color": (255, 0, 0),  # Blue
+        "dot_color": (255, 255, 255),  # White
+    },
+    "dark_bg": {
+        "background_color": (0, 0, 0),  # Black background
+        "font_color": (255, 255, 255),  # White font
+        "tick_color": (230, 230, 230),
+        "hour_color": (0, 0, 255),
+        "minute_color": (0, 255, 0),
+        "second_color": (255, 0, 0),
+        "dot_color": (255, 255, 255),
+    },
+}
+
+# Themes rendered for every font and duration
+variants = ["light_bg", "dark_bg"]
+
+# Fonts rendered together by one job, sharing the drawing of the rings. Every font and variant
+# of a job has its own frame and video encoder open (all the sizes of a font are in the same
+# job), lower this to use less memory per worker.
+# None groups as many fonts as possible while there are still at least as many segment tasks as
+# worker processes, so sharing the rings never leaves cores idle.
+fonts_per_job = None
+
+# Worker processes rendering segments at the same time, and OpenCV threads for each of them
+opencv_threads_per_worker = 1
+workers = max(1, (os.cpu_count() or 1) // opencv_threads_per_worker)
+
+# Long videos are split in segments of this many seconds (10 minutes) rendered in parallel
+# and joined with ffmpeg. Without ffmpeg every video is rendered in one piece.
+ffmpeg_binary = shutil.which("ffmpeg")
+segment_seconds = 600 if ffmpeg_binary else None
+
+# Video writer backend:
+#   "ffmpeg" - pipe raw frames to ffmpeg and encode with the settings below (see 027-benchmark escritores.py)
+#   "cv2"    - cv2.VideoWriter with the mp4v codec (previous behaviour, also used when ffmpeg is not found)
+writer_backend = "ffmpeg"
+pipe_pixel_format = "yuv420p"  # "yuv420p" or "bgr24"
+ffmpeg_codec = "libx264"
+ffmpeg_preset = "veryfast"
+ffmpeg_tune = "stillimage"  # The frames are flat colors that barely change
+gop_seconds = 10  # A keyframe every 10 seconds of video
+
+# Settings a render spec can change (see 034-trabajos.json and 040-resoluciones.json). The spec
+# file is given as the first argument; without it every font, duration of the series and variant
+# is rendered in the output sizes.
+spec_settings = [
+    "series", "default_size", "output_sizes", "fps", "font_scale", "thickness", "ring_thickness", "opacity",
+    "thin_ring_thickness", "start_angle", "render_mode", "frame_rate_mode", "writer_backend",
+    "pipe_pixel_format", "ffmpeg_codec", "ffmpeg_preset", "ffmpeg_tune", "gop_seconds",
+    "segment_seconds", "fonts_per_job", "opencv_threads_per_worker", "workers", "metrics_format",
+    "progress_format", "progress_print_seconds", "pipeline_mode", "pipeline_queue_size",
+]
+
+# Instrumentation of the render loop, exported after every job segment:
+#   None         - not exported
+#   "jsonl"      - one JSON line per job segment in render/metrics/metrics.jsonl
+#   "prometheus" - totals of the run by font and variant in render/metrics/metrics.prom,
+#                  for the textfile collector of the Prometheus node exporter
+metrics_format = None
+metrics_file = "render/metrics/metrics"
+stall_seconds = 0.05  # A frame write taking longer than this is counted as a stall
+
+# Pipeline mode: draw the frames and write them to the videos from separate threads, with a
+# queue of at most pipeline_queue_size frames for every video. The render is done in the same
+# worker processes, this only overlaps drawing and encoding inside each of them.
+pipeline_mode = True
+pipeline_queue_size = 4
+
+# Progress of the batch, printed by the main process at most every progress_print_seconds as a
+# "text" line or a "json" line. Workers report every progress_report_seconds, and the frames per
+# second of every job and of the whole batch are averaged with this smoothing factor.
+progress_format = "text"
+progress_print_seconds = 10
+progress_report_seconds = 1
+progress_smoothing = 0.2
+progress_queue = None  # Set in every worker process
+
+# File where the finished segments are recorded, so an interrupted render continues from them
+checkpoint_file = "render/checkpoint.json"
+
+# File where every finished video is recorded with the hash of its spec, so a video is rendered
+# again when any of its parameters changes
+manifest_file = "render/manifest.json"
+
+# Frame rate mode:
+#   "content"     - encode one frame per second, the rate the countdown changes, so the encoder
+#                   gets 60 times fewer frames; the result is a constant 1 fps video
+#   "content_cfr" - send one frame per second to ffmpeg, which repeats it up to the display frame
+#                   rate before encoding, for players that need a constant 60 fps stream
+#   "display"     - write every frame at the display frame rate (previous behaviour)
+frame_rate_mode = "content"
+
+
+if __name__ == "__main__":
+    # Ensure the "render" folder exists
+    os.makedirs("render", exist_ok=True)
+
+    if ffmpeg_binary is None:
+        print("ffmpeg not found, videos will be rendered without splitting them in segments.")
+    os.makedirs("render/segments", exist_ok=True)
+
+    # Load the render spec and expand its jobs into the videos they ask for
+    spec = load_json(sys.argv[1], None) if len(sys.argv) > 1 else {}
+    apply_spec(spec)
+    requested_videos, requested_count = expand_jobs(spec.get("jobs", [{}]))
+    print(f"The render spec asks for {requested_count} videos, {len(requested_videos)} of them different")
+
+    checkpoint = load_json(checkpoint_file, {"segments": {}, "keyframes": {}})
+    manifest = load_json(manifest_file, {})
+
+    # Every video is rendered, except the ones that already exist with the same spec
+    videos = []
+    for video in requested_videos:
+        reason = render_reason(manifest, *video)
+        if reason is None:
+            print(f"File {video_path(*video)} already exists. Skipping to next video.")
+            continue
+        if reason != "does not exist":
+            print(f"File {video_path(*video)} {reason}. Rendering it again.")
+        videos.append(video)
+
+    # Below one hour the hour ring is off, so the last N seconds of a countdown are exactly the same
+    # frames as a countdown of N seconds. With ffmpeg, the longest countdown up to one hour asked for
+    # is rendered as a master of every font and the shorter ones are cut from it without re-encoding.
+    # Masters finished by a previous run are in the checkpoint with the seconds they can be cut at,
+    # so the videos missing from them are cut right away.
+    trimmed_videos = {}
+    master_duration = max((duration for _, duration, _ in requested_videos if duration <= 3600), default=None)
+    if writer_backend == "ffmpeg" and ffmpeg_binary and master_duration:
+        for video in list(videos):
+            font_index, duration, variant = video
+            master_file = video_path(font_index, master_duration, variant)
+            master_finished = render_reason(manifest, font_index, master_duration, variant) is None
+            if duration < master_duration and master_finished and master_duration - duration in checkpoint["keyframes"].get(master_file, []):
+                cut_video(master_file, video_path(*video), master_duration - duration, duration)
+                record_video(manifest, *video)
+                videos.remove(video)
+
+    # The variants of a font and duration only differ in their colors and size, so they are
+    # rendered together by one job: (font, duration) -> variants
+    jobs = {}
+    for font_index, duration, variant in videos:
+        jobs.setdefault((font_index, duration), []).append(variant)
+
+    # The shorter countdowns are cut from the masters rendered now, in the variants the master
+    # is rendered in: (font, master duration) -> [(duration, variant), ...]
+    if writer_backend == "ffmpeg" and ffmpeg_binary and master_duration:
+        for (font_index, duration), job_variants in list(jobs.items()):
+            master_variants = jobs.get((font_index, master_duration))
+            if duration < master_duration and master_variants:
+                trimmed = trimmed_videos.setdefault((font_index, master_duration), [])
+                trimmed.extend((duration, variant) for variant in job_variants if variant in master_variants)
+                job_variants[:] = [variant for variant in job_variants if variant not in master_variants]
+                if not job_variants:
+                    del jobs[(font_index, duration)]
+
+    # Durations cut from every video (only masters have any): (font, duration, variant) -> [duration, ...]
+    trimmed_durations = {}
+    for (font_index, duration), trimmed in trimmed_videos.items():
+        for trimmed_duration, variant in trimmed:
+            trimmed_durations.setdefault((font_index, duration, variant), []).append(trimmed_duration)
+
+    # The rings do not depend on the font either, so the fonts of a duration are rendered together
+    # (in groups of fonts_per_job): (duration, ((font, variants), ...))
+    fonts_by_duration = {}
+    for (font_index, duration), job_variants in jobs.items():
+        fonts_by_duration.setdefault(duration, []).append((font_index, tuple(job_variants)))
+    group_size = fonts_per_job or max((len(font_variants) for font_variants in fonts_by_duration.values()), default=1)
+    if fonts_per_job is None:
+        while group_size > 1 and sum(-(-len(font_variants) // group_size) * segment_count(duration) for duration, font_variants in fonts_by_duration.items()) < workers:
+            group_size -= 1
+    duration_jobs = []
+    for duration, font_variants in fonts_by_duration.items():
+        for i in range(0, len(font_variants), group_size):
+            duration_jobs.append((duration, tuple(font_variants[i:i + group_size])))
+
+    # Longest jobs first, so the short ones fill the gaps at the end and all the workers finish together.
+    # Every segment of a job is a task; the segments of a job are queued together so its videos can be
+    # joined as soon as possible. Segments recorded in the checkpoint are not rendered again if they
+    # were made with the same segment length and have the keyframes the videos need now.
+    duration_jobs.sort(key=lambda job: job[0], reverse=True)
+    tasks = []
+    pending_segments = {}
+    for duration, font_variants in duration_jobs:
+        cut_seconds = tuple(sorted({
+            duration - trimmed_duration
+            for font_index, _ in font_variants
+            for trimmed_duration, _ in trimmed_videos.get((font_index, duration), [])
+        }))
+
+        finished_segments = {}
+        for font_index, job_variants in font_variants:
+            for variant in job_variants:
+                output_file = video_path(font_index, duration, variant)
+                needed_cut_seconds = {duration - trimmed_duration for trimmed_duration in trimmed_durations.get((font_index, duration, variant), [])}
+                video_hash = spec_hash(font_index, duration, variant)
+                entry = checkpoint["segments"].get(output_file)
+                if entry is None or entry["spec_hash"] != video_hash or entry["segment_seconds"] != segment_seconds or not needed_cut_seconds <= set(entry["cut_seconds"]):
+                    entry = {"spec_hash": video_hash, "segment_seconds": segment_seconds, "cut_seconds": list(cut_seconds), "done": []}
+                else:
+                    # Only the keyframes both the finished segments and the new ones will have
+                    entry["cut_seconds"] = sorted(set(entry["cut_seconds"]) & set(cut_seconds))
+                    entry["done"] = [i for i in entry["done"] if os.path.exists(segment_path(font_index, duration, variant, i))]
+                checkpoint["segments"][output_file] = entry
+                finished_segments[(font_index, variant)] = set(entry["done"])
+                pending_segments[(font_index, duration, variant)] = segment_count(duration) - len(entry["done"])
+
+        # Every segment task renders the videos of the job that do not have that segment yet
+        for segment_index in range(segment_count(duration)):
+            task_font_variants = []
+            for font_index, job_variants in font_variants:
+                missing_variants = tuple(variant for variant in job_variants if segment_index not in finished_segments[(font_index, variant)])
+                if missing_variants:
+                    task_font_variants.append((font_index, missing_variants))
+            if task_font_variants:
+                tasks.append((duration, tuple(task_font_variants), segment_index, cut_seconds))
+    save_json(checkpoint_file, checkpoint)
+
+    # Videos whose segments were all rendered before the previous run stopped are joined now
+    for video, pending in pending_segments.items():
+        if pending == 0:
+            finish_video(*video, trimmed_durations.get(video, []), checkpoint, manifest)
+
+    rendered_count = sum(len(job_variants) for job_variants in jobs.values())
+    trimmed_count = sum(len(trimmed) for trimmed in trimmed_videos.values())
+    print(f"Rendering {rendered_count} videos in {len(duration_jobs)} jobs of {len(tasks)} segments with {workers} worker processes, and cutting {trimmed_count} shorter videos from them")
+
+    # Progress of every task: [done frames, total frames, RateEstimator], counting the frames
+    # of all the videos of the task
+    video_fps = fps if frame_rate_mode == "display" else 1
+    progress = {}
+    for duration, font_variants, segment_index, _ in tasks:
+        first_second, last_second = segment_bounds(duration, segment_index)
+        videos_in_task = sum(len(job_variants) for _, job_variants in font_variants)
+        progress[(duration, font_variants, segment_index)] = [0, (last_second - first_second) * video_fps * videos_in_task, RateEstimator(progress_smoothing)]
+    batch_rate = RateEstimator(progress_smoothing)
+    next_print = time.perf_counter() + progress_print_seconds
+
+    metric_totals = {}
+    progress_reports = multiprocessing.Queue()
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(spec, progress_reports)) as pool:
+        results = pool.imap_unordered(render_task, tasks)
+
+        for _ in tasks:
+            # Wait for the next finished segment, checking if the Escape key is pressed via the console
+            while True:
+                if keyboard.is_pressed("esc"):  # Check if "Escape" is pressed
+                    print("Escape key pressed. Terminating the video creation process, the next run continues from the finished segments.")
+                    pool.terminate()
+                    exit()
+
+                # Take the progress reported by the workers and print it when it is time to
+                while not progress_reports.empty():
+                    key, done = progress_reports.get()
+                    # A report can arrive after the result of its task, which already counts all
+                    # its frames, so the progress never goes back
+                    if done <= progress[key][0]:
+                        continue
+                    progress[key][0] = done
+                    progress[key][2].update(done, time.perf_counter())
+                now = time.perf_counter()
+                if now >= next_print:
+                    batch_rate.update(sum(task[0] for task in progress.values()), now)
+                    print_progress(progress, batch_rate)
+                    next_print = now + progress_print_seconds
+
+                try:
+                    duration, font_variants, segment_index, job_metrics = results.next(timeout=0.1)
+                    break
+                except multiprocessing.TimeoutError:
+                    pass
+
+            # The task is done: all its frames count for the progress of the batch
+            progress[(duration, font_variants, segment_index)][0] = progress[(duration, font_variants, segment_index)][1]
+
+            if metrics_format:
+                export_metrics(job_metrics, metric_totals)
+
+            # Record the finished segment of every video of the task
+            finished_videos = []
+            for font_index, job_variants in font_variants:
+                for variant in job_variants:
+                    checkpoint["segments"][video_path(font_index, duration, variant)]["done"].append(segment_index)
+                    pending_segments[(font_index, duration, variant)] -= 1
+                    if pending_segments[(font_index, duration, variant)] == 0:
+                        finished_videos.append((font_index, duration, variant))
+            save_json(checkpoint_file, checkpoint)
+
+            # Join the videos once all their segments are rendered
+            for video in finished_videos:
+                finish_video(*video, trimmed_durations.get(video, []), checkpoint, manifest)
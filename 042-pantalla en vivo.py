@@ -0,0 +1,480 @@
+import cv2
+import numpy as np
+import math
+import sys
+import time
+from datetime import datetime, timedelta
+
+
+# Function to precompute the result of blending a color with the given opacity over every
+# 0-255 channel value. cv2.addWeighted itself is used, so looking values up in this table
+# gives the same result as blending a full overlay image.
+def blend_table(color, opacity):
+    values = np.repeat(np.arange(256, dtype=np.uint8)[:, np.newaxis], 3, axis=1)
+    overlay = np.empty_like(values)
+    overlay[:] = color
+    return cv2.addWeighted(overlay, opacity, values, 1 - opacity, 0)
+
+
+# Function to compute the color of every combination of layers of a theme.
+# The layers are stacked in the order the previous scripts drew them: background, dial,
+# semi-transparent rings blended with the same tables as before, end circle and text.
+def theme_palette(theme, opacity):
+    ring_tables = [
+        (hour_layer, blend_table(theme["hour_color"], opacity)),
+        (minute_layer, blend_table(theme["minute_color"], opacity)),
+        (second_layer, blend_table(theme["second_color"], opacity)),
+    ]
+    palette = np.empty((64, 3), dtype=np.uint8)
+    for layers in range(64):
+        color = np.array(theme["tick_color"] if layers & tick_layer else theme["background_color"], dtype=np.uint8)
+        for layer, table in ring_tables:
+            if layers & layer:
+                color = table[color, np.arange(3)]
+        if layers & dot_layer:
+            color = theme["dot_color"]
+        if layers & text_layer:
+            color = theme["font_color"]
+        palette[layers] = color
+    return palette
+
+
+# Function to add a ring with a filled circle at the end to the layer image, only inside rect.
+# The shapes are rasterized in full frame coordinates on the scratch mask (so they have exactly
+# the same pixels as when drawn on the whole frame), the ring layer is added to the masked pixels
+# of the rectangle and the mask is cleared again by drawing the shapes with 0.
+# The circle is opaque, so its pixels only keep the end circle layer.
+# The masked operations are done in place with OpenCV, without boolean index arrays.
+def draw_ring_layer(layers, mask, rect, center, radius, start_angle, end_angle, layer, thickness, dot_radius=10):
+    x0, y0, x1, y1 = rect
+    roi = layers[y0:y1, x0:x1]
+    roi_mask = mask[y0:y1, x0:x1]
+
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 255, thickness)
+    cv2.bitwise_or(roi, layer, dst=roi, mask=roi_mask)
+    cv2.ellipse(mask, center, (radius, radius), start_angle, 0, end_angle, 0, thickness)
+
+    # Calculate the position of the small white circle at the end of the arc
+    end_radian = np.radians(start_angle + end_angle)
+    circle_center = (
+        int(center[0] + radius * np.cos(end_radian)),
+        int(center[1] + radius * np.sin(end_radian))
+    )
+    # Draw the small circle
+    cv2.circle(mask, circle_center, dot_radius, 255, -1)  # Radius of 10 pixels at 1080p, filled circle
+    cv2.bitwise_and(roi, 0, dst=roi, mask=roi_mask)
+    cv2.bitwise_or(roi, dot_layer, dst=roi, mask=roi_mask)
+    cv2.circle(mask, circle_center, dot_radius, 0, -1)
+
+
+# Function to draw the static dial: thin rings with their division marks.
+# The marks never change during a video, so this is called once per video on the background.
+def draw_tick_dial(image, center, outer_radius, ring_thickness, start_angle, color, thickness, mark_length=10):
+    segments = []
+    for ring_offset, divisions in zip([0, 2, 4], [24, 60, 60]):
+        radius = outer_radius - ring_thickness * ring_offset
+        cv2.circle(image, center, radius, color, thickness)
+
+        # Angles and mark lengths of every division at once (major marks every 5 divisions)
+        index = np.arange(divisions)
+        angles = np.radians(start_angle + index * (360 / divisions))
+        line_length = np.where(index % 5 == 0, mark_length, mark_length // 2)
+        cos, sin = np.cos(angles), np.sin(angles)
+
+        # Inside marks go from (radius - length) to radius, outside marks from radius to (radius + length)
+        inner = radius - line_length
+        outer = radius + line_length
+        points = [
+            np.stack([center[0] + r * cos, center[1] + r * sin], axis=-1).astype(np.int32)
+            for r in (inner, radius, outer)
+        ]
+        segments.extend(np.stack([points[0], points[1]], axis=1))
+        segments.extend(np.stack([points[1], points[2]], axis=1))
+
+    # Draw all the marks with a single call
+    cv2.polylines(image, segments, False, color, thickness)
+
+
+# Function to lay the countdown out for a video size. The countdown was designed for 1920x1080,
+# so every length is scaled with the shorter side of the frame: the dial keeps its proportions
+# in any aspect ratio, centered on the frame, and 1920x1080 gets exactly the same pixels as before.
+def size_layout(size):
+    width, height = size
+    scale = min(width, height) / 1080
+    return {
+        "size": (width, height),
+        "center": (width // 2, height // 2),
+        "outer_radius": int((min(width, height) / 2) * 0.9),
+        "ring_thickness": max(1, round(ring_thickness * scale)),
+        "thin_ring_thickness": max(1, round(thin_ring_thickness * scale)),
+        "mark_length": max(2, round(10 * scale)),
+        "dot_radius": max(1, round(10 * scale)),
+        "font_scale": font_scale * scale,
+        "thickness": max(1, round(thickness * scale)),
+    }
+
+
+# Function to rasterize the countdown characters once for a font, scale and thickness.
+# Each glyph is kept as a mask cropped to its strokes, the offset of that crop from the
+# text origin and the advance cv2.putText moves to the right after the character. The advance
+# is kept unrounded (the width of the character in font units times the scale), because the font
+# scale of a size can be fractional and cv2.putText only rounds the sum of the advances.
+def build_glyph_atlas(font, font_scale, thickness, characters="0123456789:"):
+    (_, text_height), baseline = cv2.getTextSize(characters, font, font_scale, thickness)
+    margin = int(32 * font_scale) + thickness  # Script fonts draw well outside their text box
+
+    atlas = {}
+    for char in characters:
+        advance = (cv2.getTextSize(char, font, 1, 1)[0][0] - 1) * font_scale
+        canvas = np.zeros((text_height + baseline + 2 * margin, int(advance) + 2 * margin), dtype=np.uint8)
+        origin = (margin, margin + text_height)
+        cv2.putText(canvas, char, origin, font, font_scale, 255, thickness)
+
+        ys, xs = np.nonzero(canvas)
+        top, left = ys.min(), xs.min()
+        mask = canvas[top:ys.max() + 1, left:xs.max() + 1] > 0
+        atlas[char] = (mask, left - origin[0], top - origin[1], advance)
+    return atlas
+
+
+# Function to compute the x position of every character of a time string centered on center_x
+# (the same positions cv2.getTextSize and cv2.putText would give the whole string). Like them,
+# the advances are added unrounded and only the position of every character is rounded, so with
+# a fractional font scale the characters do not drift away from where cv2.putText draws them.
+def glyph_positions(time_str, atlas, center_x, thickness):
+    text_width = round(sum(atlas[char][3] for char in time_str) + thickness)
+    x = center_x - text_width // 2
+    positions = []
+    for char in time_str:
+        positions.append(round(x))
+        x += atlas[char][3]
+    return positions
+
+
+# Function to draw a time string by copying the cached glyph masks onto the image.
+# origin is the position of the image inside the full frame, so the text can be drawn
+# into a region of the frame; glyphs are clipped to the image.
+def draw_glyph_text(image, time_str, positions, text_y, atlas, color, origin=(0, 0)):
+    height, width = image.shape[:2]
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        top, left = text_y + offset_y - origin[1], x + offset_x - origin[0]
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + mask.shape[0], height), min(left + mask.shape[1], width)
+        if y0 < y1 and x0 < x1:
+            image[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - left:x1 - left]] = color
+
+
+# Function to get the bounding rectangle (x0, y0, x1, y1) of a time string drawn from the atlas
+def glyph_text_rect(time_str, positions, text_y, atlas):
+    x0 = y0 = float("inf")
+    x1 = y1 = float("-inf")
+    for char, x in zip(time_str, positions):
+        mask, offset_x, offset_y, _ = atlas[char]
+        x0, y0 = min(x0, x + offset_x), min(y0, text_y + offset_y)
+        x1, y1 = max(x1, x + offset_x + mask.shape[1]), max(y1, text_y + offset_y + mask.shape[0])
+    return (x0, y0, x1, y1)
+
+
+# Function to get the bounding rectangle of the part of a ring between two angles
+# (in degrees from start_angle), padded to include the ring thickness and the end circle
+def arc_rect(center, radius, start_angle, angle_from, angle_to, pad):
+    first, last = start_angle + angle_from, start_angle + angle_to
+    # The arc reaches its extremes at its ends and wherever it crosses an axis
+    angles = np.radians([first, last] + [90 * k for k in range(-(-first // 90), last // 90 + 1)])
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
+    return (int(xs.min()) - pad, int(ys.min()) - pad, int(xs.max()) + pad + 1, int(ys.max()) + pad + 1)
+
+
+# Function to check if two rectangles overlap
+def rects_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# Function to clip rectangles to the frame and merge the ones that overlap,
+# so no area of the frame is restored and redrawn twice
+def merge_rects(rects, width, height):
+    merged = []
+    for rect in rects:
+        rect = (max(rect[0], 0), max(rect[1], 0), min(rect[2], width), min(rect[3], height))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            continue
+        i = 0
+        while i < len(merged):
+            if rects_overlap(merged[i], rect):
+                other = merged.pop(i)
+                rect = (min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3]))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+# Function to get the target time of the countdown from the first argument:
+# "HH:MM" or "HH:MM:SS" is the next time the clock shows it (today or tomorrow),
+# a number is that many seconds from now, less than 100 hours (the time string has two digit hours).
+def parse_target(text, now):
+    if text.isdigit():
+        if int(text) >= 100 * 3600:
+            raise ValueError(f"The countdown must be shorter than 100 hours ({100 * 3600} seconds): {text}")
+        return now + timedelta(seconds=int(text))
+    parts = [int(part) for part in text.split(":")]
+    target = now.replace(hour=parts[0], minute=parts[1], second=parts[2] if len(parts) > 2 else 0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+# Function to get the time string and the ring angles shown with remaining_seconds left,
+# the same ones the videos show. hour_total is the number of hours of the full hour ring.
+def countdown_state(remaining_seconds, hour_total):
+    hours = remaining_seconds // 3600
+    minutes = (remaining_seconds % 3600) // 60
+    seconds = remaining_seconds % 60
+    if hours > 0:
+        time_str = two_digits[hours] + ":" + two_digits[minutes] + ":" + two_digits[seconds]
+    else:
+        time_str = two_digits[minutes] + ":" + two_digits[seconds]
+
+    hour_angle = int(360 * (hours / hour_total)) if hour_total and hours > 0 else 0
+    minute_angle = int(360 * (minutes / 60)) if minutes > 0 else 0
+    second_angle = int(360 * (seconds / 60)) if seconds > 0 else 0
+    return time_str, hour_angle, minute_angle, second_angle
+
+
+# Countdown drawn on screen in one size, font and theme. Like the videos, the rings and the text
+# are drawn as layers into a layer image that is kept between seconds, only the rectangles that
+# changed are redrawn and the frame is colored from it with the palette of the theme.
+class LiveCountdown:
+    def __init__(self, size, font, theme):
+        self.layout = size_layout(size)
+        width, height = self.layout["size"]
+        center = self.layout["center"]
+        self.palette = theme_palette(theme, opacity)
+
+        self.background = np.zeros((height, width), dtype=np.uint8)
+        draw_tick_dial(self.background, center, self.layout["outer_radius"], self.layout["ring_thickness"], start_angle, tick_layer,
+                       self.layout["thin_ring_thickness"], self.layout["mark_length"])
+        self.ring_layers = self.background.copy()
+        self.layers = self.background.copy()
+        self.ring_mask = np.zeros((height, width), dtype=np.uint8)
+        self.frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.ring_pad = max(self.layout["ring_thickness"] // 2, self.layout["dot_radius"]) + 2
+
+        self.atlas = build_glyph_atlas(font, self.layout["font_scale"], self.layout["thickness"])
+        text_height = cv2.getTextSize("0", font, self.layout["font_scale"], self.layout["thickness"])[0][1]  # Same for any string
+        self.text_y = center[1] + text_height // 2
+        self.previous_rings = None
+        self.previous_text_rect = None
+
+    # Function to draw the frame of a countdown state, redrawing only what changed since the previous one
+    def draw(self, time_str, hour_angle, minute_angle, second_angle):
+        width, height = self.layout["size"]
+        center, outer_radius, layout_ring_thickness = self.layout["center"], self.layout["outer_radius"], self.layout["ring_thickness"]
+
+        # Rings as (radius, layer, angle), a ring with angle 0 is not drawn
+        rings = [
+            (outer_radius, hour_layer, hour_angle),  # Hour ring
+            (outer_radius - layout_ring_thickness * 2, minute_layer, minute_angle),  # Minute ring
+            (outer_radius - layout_ring_thickness * 4, second_layer, second_angle),  # Second ring
+        ]
+
+        # The part of every ring between its old and new angle changed (OpenCV draws arcs with a
+        # point every 5 degrees, so the segment before the smaller angle can change too)
+        if self.previous_rings is None:
+            ring_rects = [(0, 0, width, height)]
+        else:
+            ring_rects = []
+            for (radius, _, angle), (_, _, previous_angle) in zip(rings, self.previous_rings):
+                if angle != previous_angle:
+                    ring_rects.append(arc_rect(center, radius, start_angle, min(angle, previous_angle) - 5, max(angle, previous_angle), self.ring_pad))
+        self.previous_rings = rings
+
+        for rect in merge_rects(ring_rects, width, height):
+            x0, y0, x1, y1 = rect
+            self.ring_layers[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+            for radius, layer, angle in rings:
+                if angle > 0 and rects_overlap(arc_rect(center, radius, start_angle, 0, angle, self.ring_pad), rect):
+                    draw_ring_layer(self.ring_layers, self.ring_mask, rect, center, radius, start_angle, angle, layer,
+                                    layout_ring_thickness, self.layout["dot_radius"])
+
+        # Center the countdown timer on the screen; its old and new rectangles changed too
+        positions = glyph_positions(time_str, self.atlas, center[0], self.layout["thickness"])
+        text_rect = glyph_text_rect(time_str, positions, self.text_y, self.atlas)
+        dirty_rects = ring_rects + [text_rect]
+        if self.previous_text_rect is not None:
+            dirty_rects.append(self.previous_text_rect)
+        self.previous_text_rect = text_rect
+
+        for rect in merge_rects(dirty_rects, width, height):
+            x0, y0, x1, y1 = rect
+            roi = self.layers[y0:y1, x0:x1]
+            roi[:] = self.ring_layers[y0:y1, x0:x1]
+            if rects_overlap(text_rect, rect):
+                draw_glyph_text(roi, time_str, positions, self.text_y, self.atlas, text_layer, (x0, y0))
+            np.take(self.palette, roi, axis=0, out=self.frame[y0:y1, x0:x1], mode="clip")
+        return self.frame
+
+
+# Function to show the countdown to target in a window until Escape is pressed or the window is closed.
+# The loop ticks display_fps times per second at deadlines computed from its start (never from the
+# previous tick), so waiting errors do not add up and it never drifts. The remaining time is taken
+# from the wall clock at every tick, and the frame is only redrawn and shown when it changes.
+# When a tick comes late (the machine fell behind) the ticks already missed are dropped instead of
+# being run one after the other, so the screen never lags behind the clock.
+def run_live(target):
+    countdown = LiveCountdown(sizes[size], fonts[font_index], themes[theme])
+    window = "Countdown"
+    cv2.namedWindow(window, cv2.WINDOW_NORMAL)
+    if fullscreen:
+        cv2.setWindowProperty(window, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+
+    # The hour ring is full at the start, like in a video of the same duration
+    start_remaining = max(0, math.ceil((target - datetime.now()).total_seconds()))
+    hour_total = min(start_remaining // 3600, 24)
+
+    tick_seconds = 1 / display_fps
+    start = time.perf_counter()
+    tick = 0
+    shown_remaining = None
+    redraws = dropped = 0
+    max_late = 0.0
+
+    while True:
+        remaining = max(0, math.ceil((target - datetime.now()).total_seconds()))
+        if remaining != shown_remaining:
+            shown_remaining = remaining
+            cv2.imshow(window, countdown.draw(*countdown_state(remaining, hour_total)))
+            redraws += 1
+
+        # Wait for the next tick (waitKey also lets the window handle its events)
+        tick += 1
+        delay = start + tick * tick_seconds - time.perf_counter()
+        key = cv2.waitKey(max(1, int(delay * 1000)))
+        if key == 27 or cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) < 1:  # Escape or window closed
+            break
+
+        # Drop the ticks that already passed
+        late = time.perf_counter() - (start + tick * tick_seconds)
+        max_late = max(max_late, late)
+        if late > tick_seconds:
+            missed = int(late / tick_seconds)
+            tick += missed
+            dropped += missed
+
+    cv2.destroyAllWindows()
+    print(f"Ticks: {tick}, redraws: {redraws}, dropped ticks: {dropped}, latest tick: {max_late * 1000:.1f} ms")
+
+
+# List of available fonts in OpenCV
+fonts = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX_SMALL,
+    cv2.FONT_HERSHEY_SCRIPT_SIMPLEX,
+    cv2.FONT_HERSHEY_SCRIPT_COMPLEX,
+]
+
+# Screen sizes (the same as 040-resoluciones.py)
+sizes = {
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "720p": (1280, 720),
+    "vertical": (1080, 1920),  # Portrait screens and phone stories
+}
+
+# Countdown shown: font, theme and size, and the rate the loop checks the clock at.
+# The window can be resized, it shows the frame scaled to it.
+font_index = 0
+theme = "dark_bg"
+size = "1080p"
+display_fps = 60
+fullscreen = True
+
+# Define a smaller font scale and thickness for the text
+font_scale = 4  # Smaller text for the countdown
+thickness = 16  # Slightly reduced thickness for countdown
+
+# Ring properties
+ring_thickness = 50
+opacity = 0.9  # Semi-transparent rings (90% opacity, 10% transparency)
+thin_ring_thickness = 2  # Thin rings for the divisions
+
+# Rotate the rings 90 degrees counterclockwise by adding 90 degrees to the start angle
+start_angle = -90
+
+# Two digit strings "00".."99", so the time string is not formatted for every frame
+two_digits = [f"{i:02}" for i in range(100)]
+
+# Layers of the countdown, stored as bits in every pixel of the layer image
+tick_layer = 1  # Thin rings and division marks
+hour_layer = 2
+minute_layer = 4
+second_layer = 8
+dot_layer = 16  # Circle at the end of a ring
+text_layer = 32
+
+# Color themes
+themes = {
+    "light_bg": {
+        "background_color": (255, 255, 255),  # White background
+        "font_color": (0, 0, 0),  # Black font
+        "tick_color": (230, 230, 230),  # Grey
+        "hour_color": (0, 0, 255),  # Red
+        "minute_color": (0, 255, 0),  # Green
+        "second_color": (255, 0, 0),  # Blue
+        "dot_color": (255, 255, 255),  # White
+    },
+    "dark_bg": {
+        "background_color": (0, 0, 0),  # Black background
+        "font_color": (255, 255, 255),  # White font
+        "tick_color": (230, 230, 230),
+        "hour_color": (0, 0, 255),
+        "minute_color": (0, 255, 0),
+        "second_color": (255, 0, 0),
+        "dot_color": (255, 255, 255),
+    },
+}
+
+
+if __name__ == "__main__":
+    # Usage: 042-pantalla en vivo.py TARGET [FONT] [THEME] [SIZE]
+    # TARGET is a time of day like 18:00 or a number of seconds from now
+    usage = "Usage: python \"042-pantalla en vivo.py\" 18:00 [font index] [theme] [size]"
+    if len(sys.argv) < 2:
+        print(usage)
+        sys.exit(1)
+
+    # Check every argument before the window opens, printing the usage after the first wrong one
+    error = None
+    try:
+        target = parse_target(sys.argv[1], datetime.now())
+    except ValueError as target_error:
+        error = f"Invalid target: {target_error}"
+    if error is None and len(sys.argv) > 2:
+        if sys.argv[2].isdigit() and int(sys.argv[2]) < len(fonts):
+            font_index = int(sys.argv[2])
+        else:
+            error = f"Invalid font index: {sys.argv[2]} (from 0 to {len(fonts) - 1})"
+    if error is None and len(sys.argv) > 3:
+        if sys.argv[3] in themes:
+            theme = sys.argv[3]
+        else:
+            error = f"Unknown theme: {sys.argv[3]} (one of {', '.join(themes)})"
+    if error is None and len(sys.argv) > 4:
+        if sys.argv[4] in sizes:
+            size = sys.argv[4]
+        else:
+            error = f"Unknown size: {sys.argv[4]} (one of {', '.join(sizes)})"
+    if error is not None:
+        print(error)
+        print(usage)
+        sys.exit(1)
+
+    print(f"Counting down to {target:%Y-%m-%d %H:%M:%S} with font {font_index}, theme {theme} and size {size}. Press Escape to quit.")
+    run_live(target)